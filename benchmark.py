@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the game engine's hot paths.
+
+    python benchmark.py                       # run and print
+    python benchmark.py --save base.json      # also write the results as a baseline
+    python benchmark.py --compare base.json   # print the change against a baseline
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append('.')
+
+from game.blackjack import Blackjack
+from game.card import Card
+from game.shoe import Shoe
+
+HAND = [Card("A", "S"), Card("8", "H"), Card("7", "C")]
+
+
+def make_game(backend):
+    if backend == "shoe":
+        return Blackjack(Shoe(rng=random.Random(1)))
+    return Blackjack(rng=random.Random(1))
+
+
+def fresh_round(game):
+    # Deal until the player has a decision to make
+    game.start_game()
+    while game.gameOver or game.currentTurn != "Player":
+        game.start_game()
+
+
+def stand_on_17(game):
+    game.start_game()
+    while not game.gameOver and game.currentTurn == "Player":
+        if game.playerScore < 17:
+            game.hit()
+        else:
+            game.stand()
+    return game.settle()
+
+
+def drain(game):
+    # Leave exactly DECK_THRESHOLD cards, so check_deck has to rebuild and reshuffle
+    if game.shoe is not None:
+        game.shoe.pos = game.shoe.size - game.DECK_THRESHOLD
+    else:
+        del game.deck[game.DECK_THRESHOLD:]
+
+
+def to_dealer(game):
+    fresh_round(game)
+    game.currentTurn = "Dealer"
+
+
+# name -> (prepare, op); prepare runs untimed before every op
+def benchmarks(game):
+    return {
+        "create_deck": (None, game.create_deck),
+        "shuffle_deck": (game.create_deck, game.shuffle_deck),
+        "check_deck": (lambda: drain(game), game.check_deck),
+        "calculate_score": (None, lambda: game.calculate_score(HAND)),
+        "deal_cards": (game.reset_game, game.deal_cards),
+        "hit": (lambda: fresh_round(game), game.hit),
+        "dealer_turn": (lambda: to_dealer(game), game.dealer_turn),
+        "round": (None, lambda: stand_on_17(game)),
+    }
+
+
+def percentile(times, q):
+    return times[min(len(times) - 1, int(q * len(times)))]
+
+
+def measure(prepare, op, ops):
+    times = []
+    for i in range(ops):
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter_ns()
+        op()
+        times.append(time.perf_counter_ns() - start)
+    times.sort()
+
+    # Separate pass: tracing slows every allocation down, so it is not timed
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    peak = 0
+    for i in range(min(ops, 1000)):
+        if prepare is not None:
+            prepare()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        op()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    net = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(len(times) / (sum(times) / 1e9), 1),
+        "p50_ns": percentile(times, 0.5),
+        "p90_ns": percentile(times, 0.9),
+        "p99_ns": percentile(times, 0.99),
+        "peak_alloc_bytes": peak,
+        "retained_bytes": net,
+    }
+
+
+def run(ops):
+    results = {}
+    for backend in ("list", "shoe"):
+        game = make_game(backend)
+        game.create_deck()
+        game.shuffle_deck()
+        for name, (prepare, op) in benchmarks(game).items():
+            op()  # warm up
+            results[f"{name}[{backend}]"] = measure(prepare, op, ops)
+    return results
+
+
+def report(results, baseline=None):
+    print(f"{'benchmark':24} {'ops/sec':>12} {'p50 ns':>9} {'p90 ns':>9} {'p99 ns':>9} {'peak B':>8}")
+    for name, r in results.items():
+        line = (
+            f"{name:24} {r['ops_per_sec']:12,.0f} {r['p50_ns']:9} {r['p90_ns']:9} "
+            f"{r['p99_ns']:9} {r['peak_alloc_bytes']:8}"
+        )
+        old = (baseline or {}).get(name)
+        if old:
+            change = r["ops_per_sec"] / old["ops_per_sec"] - 1
+            line += f"   {change:+.1%} ops/sec vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game engine")
+    parser.add_argument("--ops", type=int, default=20000, help="timed calls per benchmark")
+    parser.add_argument("--save", help="write the results to this JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+
+    results = run(args.ops)
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "ops": args.ops, "results": results},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"\nBaseline saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Vectorized bankroll paths: ruin probability, session length and drawdowns
+import numpy as np
+
+from game.betting import BetRamp
+from game.simulate import DEAL_CARDS, ShoeBatch, play_round, ramp_wagers
+from game.strategy import Strategy
+
+STARTING_CHIPS = 1000  # config.STARTING_CHIPS; config itself needs the GUI toolkit
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _quantiles(values):
+    return {q: float(v) for q, v in zip(QUANTILES, np.quantile(values, QUANTILES))}
+
+
+def simulate_bankroll(
+    bankroll=STARTING_CHIPS,
+    bet=10,
+    paths=4096,
+    rounds=10_000,
+    rules=None,
+    min_bet=None,
+    stand_on=17,
+    strategy=None,
+    seed=None,
+):
+    """Play up to `rounds` rounds on `paths` independent bankrolls, one ShoeBatch lane each.
+
+    bet is a flat wager, a game.betting.BetRamp read at each lane's true count, or a
+    callable policy(bankrolls, shoe) returning one wager per lane; wagers are capped at
+    what the bankroll holds. A path is ruined once it cannot cover min_bet (the flat
+    bet, the ramp's smallest bet, or 1 for a policy) and stops playing.
+    Rounds are played as in game.simulate.play_round (hit/stand only).
+    """
+    if min_bet is None:
+        if isinstance(bet, BetRamp):
+            min_bet = bet.minimum
+        else:
+            min_bet = 1 if callable(bet) else bet
+    shoe = ShoeBatch(paths, rules, seed)
+    chips = np.full(paths, float(bankroll))
+    peak = chips.copy()
+    drawdown = np.zeros(paths)
+    ruined_at = np.zeros(paths, dtype=np.int64)  # 0 while the path survives
+
+    for r in range(1, rounds + 1):
+        alive = ruined_at == 0
+        if not alive.any():
+            break
+        if isinstance(bet, BetRamp):
+            shoe.check(cards=DEAL_CARDS)
+            wager = ramp_wagers(bet, shoe.true_count())
+        elif callable(bet):
+            wager = bet(chips, shoe)
+        else:
+            wager = np.full(paths, float(bet))
+        wager = np.minimum(wager, chips) * alive
+        outcome, net, naturals = play_round(shoe, stand_on, strategy)
+        chips += wager * net
+        np.maximum(peak, chips, out=peak)
+        np.maximum(drawdown, peak - chips, out=drawdown)
+        ruined_at[alive & (chips < min_bet)] = r
+
+    ruined = ruined_at > 0
+    length = np.where(ruined, ruined_at, rounds)
+    return {
+        "paths": paths,
+        "rounds": rounds,
+        "bankroll": bankroll,
+        "ruin_probability": float(ruined.mean()),
+        "median_session_length": float(np.median(length)),
+        "median_rounds_to_ruin": float(np.median(ruined_at[ruined])) if ruined.any() else None,
+        "drawdown_quantiles": _quantiles(drawdown),
+        "final_bankroll_quantiles": _quantiles(chips),
+    }
+
+
+def main():
+    report = simulate_bankroll(rounds=2000, strategy=Strategy.solved(), seed=2024)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# True-count bet ramps compiled into a lookup table, for bots and the simulators
+import math
+
+# Counts are floored and clamped to this range; ramps are flat beyond it
+LOW_COUNT = -10
+HIGH_COUNT = 10
+
+
+class BetRamp:
+    """Wager per Hi-Lo true count, e.g. BetRamp({2: 2, 3: 4, 4: 8}, unit=10).
+
+    Each key is the true count from which its number of units applies, and counts
+    below the lowest key bet `base` units. The ramp is compiled into self.table,
+    indexed by floor(true count) - LOW_COUNT, so a wager is one lookup.
+    """
+
+    def __init__(self, ramp, unit=1, base=1):
+        if unit <= 0 or base <= 0 or any(units <= 0 for units in ramp.values()):
+            raise ValueError("bet units must be positive")
+        self.ramp = dict(ramp)
+        self.unit = unit
+        self.base = base
+        table = []
+        for count in range(LOW_COUNT, HIGH_COUNT + 1):
+            steps = [key for key in self.ramp if key <= count]
+            units = self.ramp[max(steps)] if steps else base
+            table.append(units * unit)
+        self.table = tuple(table)
+        self.minimum = min(self.table)
+
+    def wager(self, true_count, bankroll=None):
+        """The ramp's bet at this true count, capped at the bankroll if one is given."""
+        index = min(max(math.floor(true_count), LOW_COUNT), HIGH_COUNT) - LOW_COUNT
+        bet = self.table[index]
+        return bet if bankroll is None else min(bet, bankroll)
+
+    def spread(self):
+        return max(self.table) / self.minimum
+
+    def __repr__(self):
+        return f"BetRamp({self.ramp}, unit={self.unit}, base={self.base})"
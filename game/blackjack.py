@@ -1,14 +1,65 @@
 # Core game logic (rules, deck, hands, etc.)
 import random
+from collections import namedtuple
 
-from game.card import Card
+from game.hand import HandTotal
+from game.rules import RuleSet
+from game.shoe import card_from_code, shoe_cards
+
+# Everything restore() needs to put a Blackjack back where snapshot() was taken
+GameSnapshot = namedtuple(
+    "GameSnapshot",
+    [
+        "shoe",
+        "rngState",
+        "count",
+        "hands",
+        "handTotals",
+        "handWagers",
+        "handResults",
+        "activeHand",
+        "dealerHand",
+        "dealerTotal",
+        "playerScore",
+        "dealerScore",
+        "gameOver",
+        "currentTurn",
+        "blackjack",
+        "playerBlackjackPayout",
+        "dealerBlackjack",
+        "insuranceBet",
+        "evenMoney",
+        "result",
+    ],
+)
 
 
 class Blackjack:
-    DECK_THRESHOLD = int(416 * 0.6)  # ~40% of the deck remaining
+    DECK_THRESHOLD = int(416 * 0.6)  # ~40% of the deck remaining with the default rules
 
-    def __init__(self):
+    def __init__(self, shoe=None, rng=None, counter=None, rules=None):
+        # game.rules.RuleSet; its compiled tables replace the hard-coded 8 decks / S17 / 3:2
+        self.rules = rules if rules is not None else RuleSet()
+        if shoe is not None and shoe.decks != self.rules.decks:
+            raise ValueError("shoe deck count does not match the rules")
+        if counter is not None and counter.decks != self.rules.decks:
+            raise ValueError("counter deck count does not match the rules")
+        self.DECK_THRESHOLD = self.rules.threshold
+        self.dealerHits = self.rules.dealer_hits
+        self.deckTemplate = shoe_cards(self.rules.decks)
         self.deck = []
+        # Optional compact game.shoe.Shoe; when set it replaces the Card list in self.deck
+        self.shoe = shoe
+        # Anything with a shuffle() method: random.Random(seed) for reproducible games, or
+        # game.rng.NumpyShuffler(rules.cards) for bulk PCG64 permutations (close() it, or
+        # use it in a with block, when the game is done if it prefetches)
+        self.rng = rng if rng is not None else random
+        # Optional game.count.HiLoCounter, fed every card as it is drawn
+        self.counter = counter
+        # Optional game.replay.Recorder, told about each deal, action and finished round
+        self.recorder = None
+        # A game.table.Table turns this off and plays one dealer hand for all its seats
+        self.dealerPlays = True
         # TODO: Create player and dealer objects
         #        self.player = Player()
         #        self.dealer = Dealer()
@@ -19,40 +70,58 @@ class Blackjack:
         self.playerBet = 0
         self.blackjack = False
         self.playerBlackjackPayout = False
+        self.dealerBlackjack = False
+        self.insuranceBet = 0  # side bet in initial bets; 0.5 when insurance is taken
+        self.evenMoney = False
         self.result = None
-        self.playerHand = []
         self.dealerHand = []
+        self.dealerTotal = HandTotal()
+        # Fixed player hand slots for splits; playerHand/playerTotal/playerScore always
+        # refer to the slot being played (activeHand), so a one-hand round reads as before
+        maxHands = self.rules.max_hands
+        self.hands = [[] for i in range(maxHands)]
+        self.handTotals = [HandTotal() for i in range(maxHands)]
+        self.handWagers = [1] * maxHands  # wager per slot, in initial bets (2 once doubled)
+        self.handResults = [None] * maxHands
+        self.handCount = 1
+        self.activeHand = 0
+        self.playerHand = self.hands[0]
+        self.playerTotal = self.handTotals[0]
 
     def create_deck(self):
-        self.deck = []
-        for suit in ["C", "D", "H", "S"] * 8:
-            for rank in [
-                "A",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "10",
-                "J",
-                "Q",
-                "K",
-            ]:
-                self.deck.append(Card(rank, suit))
+        if self.shoe is not None:
+            self.shoe.build()
+            return
+        # Refill in place from the shared template; Cards are never mutated, so no new objects
+        self.deck[:] = self.deckTemplate
 
     def shuffle_deck(self):
-        if self.deck == []:
+        if self.counter is not None:
+            self.counter.reset()
+        if self.shoe is not None:
+            self.shoe.shuffle()
+        elif self.deck == []:
             self.create_deck()
-            random.shuffle(self.deck)
+            self.rng.shuffle(self.deck)
         else:
-            random.shuffle(self.deck)
+            self.rng.shuffle(self.deck)
 
-    def check_deck(self):
-        """Ensure deck has enough cards; refresh and shuffle if ≤ DECK_THRESHOLD or empty."""
-        if not self.deck or len(self.deck) <= self.DECK_THRESHOLD:
+    def return_discards(self):
+        # A continuous shuffler takes the last round's cards back before every deal
+        if self.shoe is not None and self.shoe.continuous:
+            self.shoe.collect()
+            if self.counter is not None:
+                self.counter.reset()
+
+    def check_deck(self, cards=1):
+        """Ensure deck has enough cards; refresh and shuffle if ≤ DECK_THRESHOLD or fewer than
+        `cards` remain (deal_cards asks for all four of its cards at once)."""
+        if self.shoe is not None and self.shoe.continuous:
+            # Cards on the table must stay out of the machine; discards only go back
+            # through return_discards() between rounds
+            return
+        remaining = len(self.shoe) if self.shoe is not None else len(self.deck)
+        if remaining < cards or remaining <= self.DECK_THRESHOLD:
             self.create_deck()
             self.shuffle_deck()
 
@@ -61,7 +130,7 @@ class Blackjack:
         aces = 0
 
         for card in hand:
-            total += card.get_value()
+            total += card.value
             if card.isAce:
                 aces += 1
 
@@ -71,30 +140,88 @@ class Blackjack:
 
         return total
 
+    def draw_card(self):
+        if self.shoe is not None:
+            card = card_from_code(self.shoe.draw())
+        else:
+            card = self.deck.pop()
+        if self.counter is not None:
+            self.counter.observe(card.value)
+        return card
+
+    def reset_hands(self):
+        # Clear the slots in place instead of allocating new hand lists
+        for i in range(self.handCount):
+            self.hands[i].clear()
+            self.handTotals[i].reset()
+            self.handWagers[i] = 1
+            self.handResults[i] = None
+        self.handCount = 1
+        self.activeHand = 0
+        self.playerHand = self.hands[0]
+        self.playerTotal = self.handTotals[0]
+
     def deal_cards(self):
-        self.check_deck()
-        self.playerHand = []
+        self.return_discards()
+        self.check_deck(4)
+        if self.recorder is not None:
+            self.recorder.begin(self)
+        self.reset_hands()
         self.dealerHand = []
-        self.playerScore = 0
-        self.dealerScore = 0
+        self.dealerTotal.reset()
         for i in range(2):
-            self.playerHand.append(self.deck.pop())
-            self.dealerHand.append(self.deck.pop())
-        self.playerScore = self.calculate_score(self.playerHand)
-        self.dealerScore = self.calculate_score(self.dealerHand)
+            card = self.draw_card()
+            self.playerHand.append(card)
+            self.playerTotal.add(card.value)
+            card = self.draw_card()
+            self.dealerHand.append(card)
+            self.dealerTotal.add(card.value)
+        self.open_round()
+
+    def open_round(self):
+        """Score the dealt cards, then offer insurance or settle naturals."""
+        self.playerScore = self.playerTotal.score
+        self.dealerScore = self.dealerTotal.score
+        if self.rules.insurance and self.dealerHand[0].isAce:
+            # Insurance / even money is decided before naturals are settled
+            self.currentTurn = "Insurance"
+        else:
+            self.check_blackjack()
+
+    def insurance(self, take=True):
+        """Answer the insurance offer (half the bet, paid 2:1 if the dealer has a natural)."""
+        if self.gameOver or self.currentTurn != "Insurance":
+            return False
+        if self.recorder is not None:
+            self.recorder.action("insurance" if take else "decline")
+        if take:
+            self.insuranceBet = 0.5
+        self.currentTurn = "Player"
         self.check_blackjack()
+        return True
+
+    def even_money(self):
+        """Take a guaranteed 1:1 for a natural against a dealer Ace."""
+        if self.currentTurn != "Insurance" or self.playerTotal.score != 21:
+            return False
+        if self.recorder is not None:
+            self.recorder.action("even_money")
+        self.evenMoney = True
+        self.currentTurn = "Player"
+        self.check_blackjack()
+        return True
 
     def check_blackjack(self):
+        # Two cards can only make 21 as Ace + ten-value, so the values alone decide a natural
         player_blackjack = (
             len(self.playerHand) == 2
-            and self.calculate_score(self.playerHand) == 21
-            and any(card.isAce for card in self.playerHand)
+            and self.playerHand[0].value + self.playerHand[1].value == 21
         )
         dealer_blackjack = (
             len(self.dealerHand) == 2
-            and self.calculate_score(self.dealerHand) == 21
-            and any(card.isAce for card in self.dealerHand)
+            and self.dealerHand[0].value + self.dealerHand[1].value == 21
         )
+        self.dealerBlackjack = dealer_blackjack
         if player_blackjack and dealer_blackjack:
             self.blackjack = True
             self.result = "draw"
@@ -110,54 +237,276 @@ class Blackjack:
             self.result = "lose"
             self.gameOver = True
             self.playerBlackjackPayout = False
+        self.handResults[0] = self.result
+        if self.gameOver and self.recorder is not None:
+            self.recorder.end(self)
         return self.blackjack
 
-    def determine_winner(self):
-        if self.playerScore > 21:
-            self.result = "lose"
+    def player_natural(self):
+        # A two-card 21 after a split is not a natural
+        return self.handCount == 1 and self.playerTotal.is_blackjack()
+
+    def hand_result(self, score):
+        if score > 21:
+            return "lose"
         elif self.dealerScore > 21:
-            self.result = "win"
-        elif self.playerScore > self.dealerScore:
-            self.result = "win"
-        elif self.playerScore < self.dealerScore:
-            self.result = "lose"
+            return "win"
+        elif score > self.dealerScore:
+            return "win"
+        elif score < self.dealerScore:
+            return "lose"
+        return "draw"
+
+    def determine_winner(self):
+        if self.handCount == 1:
+            self.result = self.hand_result(self.playerScore)
+            self.handResults[0] = self.result
         else:
-            self.result = "draw"
+            for i in range(self.handCount):
+                self.handResults[i] = self.hand_result(self.handTotals[i].score)
+            # After a split, result sums up the hands by their wagers
+            net = self.settle()
+            self.result = "win" if net > 0 else "lose" if net < 0 else "draw"
         self.gameOver = True
+        if self.recorder is not None:
+            self.recorder.end(self)
+
+    def settle(self):
+        """Net result of the finished round, in initial bets (a doubled win is +2)."""
+        payouts = self.rules.payouts
+        if self.evenMoney:
+            return payouts["even_money"]
+        if self.playerBlackjackPayout:
+            net = self.rules.blackjack_payout
+        else:
+            net = 0
+            for i in range(self.handCount):
+                net += payouts[self.handResults[i]] * self.handWagers[i]
+        if self.insuranceBet:
+            if self.dealerBlackjack:
+                net += self.insuranceBet * payouts["insurance"]
+            else:
+                net -= self.insuranceBet
+        return net
 
     def place_bet(self):
         pass
 
     def hit(self):
         if not self.gameOver and self.currentTurn == "Player":
+            if self.recorder is not None:
+                self.recorder.action("hit")
             self.check_deck()
-            self.playerHand.append(self.deck.pop())
-            self.playerScore = self.calculate_score(self.playerHand)
+            card = self.draw_card()
+            self.playerHand.append(card)
+            self.playerScore = self.playerTotal.add(card.value)
             if self.playerScore > 21:
-                self.result = "lose"
-                self.gameOver = True
+                self.handResults[self.activeHand] = "lose"
+                self.next_hand()
 
     def stand(self):
         if not self.gameOver and self.currentTurn == "Player":
+            if self.recorder is not None:
+                self.recorder.action("stand")
+            self.next_hand()
+
+    def next_hand(self):
+        """Finish the active hand and move to the next split hand, or to the dealer."""
+        while self.activeHand + 1 < self.handCount:
+            self.activeHand += 1
+            self.playerHand = self.hands[self.activeHand]
+            self.playerTotal = self.handTotals[self.activeHand]
+            # A split hand gets its second card when it comes into play
+            self.check_deck()
+            card = self.draw_card()
+            self.playerHand.append(card)
+            self.playerScore = self.playerTotal.add(card.value)
+            # Split Aces get one card each and cannot be played further
+            if not self.playerHand[0].isAce:
+                return
+        if all(self.handResults[i] == "lose" for i in range(self.handCount)):
+            # Every hand busted: the round ends without a dealer turn
+            self.result = "lose"
+            self.gameOver = True
+            if self.recorder is not None:
+                self.recorder.end(self)
+        else:
             self.currentTurn = "Dealer"
-            self.dealer_turn()
+            if self.dealerPlays:
+                self.dealer_turn()
+
+    def can_split(self):
+        hand = self.playerHand
+        return (
+            not self.gameOver
+            and self.currentTurn == "Player"
+            and self.handCount < len(self.hands)
+            and len(hand) == 2
+            and hand[0].value == hand[1].value
+            # Split Aces cannot be resplit
+            and not (hand[0].isAce and self.handCount > 1)
+        )
 
     def split(self):
-        pass
+        if not self.can_split():
+            return False
+        if self.recorder is not None:
+            self.recorder.action("split")
+        i = self.activeHand
+        j = self.handCount
+        card = self.playerHand.pop()
+        self.hands[j].append(card)
+        self.handTotals[j].add(card.value)
+        self.handWagers[j] = self.handWagers[i]
+        self.handCount += 1
+        self.playerTotal.reset()
+        self.playerTotal.add(self.playerHand[0].value)
+
+        self.check_deck()
+        card = self.draw_card()
+        self.playerHand.append(card)
+        self.playerScore = self.playerTotal.add(card.value)
+        # Split Aces get one card each and cannot be played further
+        if self.playerHand[0].isAce:
+            self.next_hand()
+        return True
 
     def check_bust(self):
         return self.playerScore > 21 or self.dealerScore > 21
 
+    def can_surrender(self):
+        # Late surrender: only the first decision on the original two cards
+        return (
+            self.rules.surrender
+            and not self.gameOver
+            and self.currentTurn == "Player"
+            and self.handCount == 1
+            and len(self.playerHand) == 2
+        )
+
+    def surrender(self):
+        """Give up the hand for half the bet back."""
+        if not self.can_surrender():
+            return False
+        if self.recorder is not None:
+            self.recorder.action("surrender")
+        self.result = "surrender"
+        self.handResults[0] = "surrender"
+        self.gameOver = True
+        if self.recorder is not None:
+            self.recorder.end(self)
+        return True
+
+    def can_double(self):
+        return (
+            not self.gameOver
+            and self.currentTurn == "Player"
+            and len(self.playerHand) == 2
+            and (self.handCount == 1 or self.rules.double_after_split)
+        )
+
     def double_down(self):
-        pass
+        """Double the active hand's wager, take exactly one card and stand."""
+        if not self.can_double():
+            return False
+        if self.recorder is not None:
+            self.recorder.action("double")
+        self.handWagers[self.activeHand] *= 2
+        self.check_deck()
+        card = self.draw_card()
+        self.playerHand.append(card)
+        self.playerScore = self.playerTotal.add(card.value)
+        if self.playerScore > 21:
+            self.handResults[self.activeHand] = "lose"
+        self.next_hand()
+        return True
 
     def dealer_turn(self):
-        while self.dealerScore < 17:
+        while self.dealerHits[self.dealerScore * 2 + self.dealerTotal.soft]:
             self.check_deck()
-            self.dealerHand.append(self.deck.pop())
-            self.dealerScore = self.calculate_score(self.dealerHand)
+            card = self.draw_card()
+            self.dealerHand.append(card)
+            self.dealerScore = self.dealerTotal.add(card.value)
         self.determine_winner()
 
+    def snapshot(self, rng=True):
+        """Capture the round for branching lookahead; see restore().
+
+        A compact Shoe is shared with the snapshot (it only copies itself if it is
+        reshuffled afterwards); the list deck has to be copied. The state of the rng that
+        shuffles (or, for a ContinuousShoe, draws) is saved when it has getstate(), as
+        random.Random does, so a branch that crosses a reshuffle replays the same cards.
+        Other rngs, e.g. game.rng.NumpyShuffler, reshuffle differently in every branch.
+        Copying a Mersenne Twister state costs several times the rest of the snapshot,
+        so rng=False skips it for searches that never reach the reshuffle threshold.
+        The default rng, the random module itself, is never captured: restoring it would
+        rewind every other user of the process-wide generator. Pass a random.Random to
+        make reshuffles reproducible across branches.
+        """
+        shuffler = self.shoe.rng if self.shoe is not None else self.rng
+        private = shuffler is not random and hasattr(shuffler, "getstate")
+        return GameSnapshot(
+            self.shoe.snapshot() if self.shoe is not None else tuple(self.deck),
+            shuffler.getstate() if rng and private else None,
+            (self.counter.running, self.counter.seen) if self.counter is not None else None,
+            tuple(tuple(self.hands[i]) for i in range(self.handCount)),
+            tuple(self.handTotals[i].state() for i in range(self.handCount)),
+            tuple(self.handWagers[:self.handCount]),
+            tuple(self.handResults[:self.handCount]),
+            self.activeHand,
+            tuple(self.dealerHand),
+            self.dealerTotal.state(),
+            self.playerScore,
+            self.dealerScore,
+            self.gameOver,
+            self.currentTurn,
+            self.blackjack,
+            self.playerBlackjackPayout,
+            self.dealerBlackjack,
+            self.insuranceBet,
+            self.evenMoney,
+            self.result,
+        )
+
+    def restore(self, snapshot):
+        if self.shoe is not None:
+            self.shoe.restore(snapshot.shoe)
+        else:
+            self.deck[:] = snapshot.shoe
+        if snapshot.rngState is not None:
+            rng = self.shoe.rng if self.shoe is not None else self.rng
+            rng.setstate(snapshot.rngState)
+        if snapshot.count is not None:
+            self.counter.running, self.counter.seen = snapshot.count
+        handCount = len(snapshot.hands)
+        for i in range(max(handCount, self.handCount)):
+            if i < handCount:
+                self.hands[i][:] = snapshot.hands[i]
+                self.handTotals[i].restore(snapshot.handTotals[i])
+                self.handWagers[i] = snapshot.handWagers[i]
+                self.handResults[i] = snapshot.handResults[i]
+            else:
+                self.hands[i].clear()
+                self.handTotals[i].reset()
+                self.handWagers[i] = 1
+                self.handResults[i] = None
+        self.handCount = handCount
+        self.activeHand = snapshot.activeHand
+        self.playerHand = self.hands[self.activeHand]
+        self.playerTotal = self.handTotals[self.activeHand]
+        self.dealerHand[:] = snapshot.dealerHand
+        self.dealerTotal.restore(snapshot.dealerTotal)
+        self.playerScore = snapshot.playerScore
+        self.dealerScore = snapshot.dealerScore
+        self.gameOver = snapshot.gameOver
+        self.currentTurn = snapshot.currentTurn
+        self.blackjack = snapshot.blackjack
+        self.playerBlackjackPayout = snapshot.playerBlackjackPayout
+        self.dealerBlackjack = snapshot.dealerBlackjack
+        self.insuranceBet = snapshot.insuranceBet
+        self.evenMoney = snapshot.evenMoney
+        self.result = snapshot.result
+
     def start_game(self):
         self.reset_game()
         self.deal_cards()
@@ -170,6 +519,10 @@ class Blackjack:
         self.playerBet = 0
         self.blackjack = False
         self.playerBlackjackPayout = False
+        self.dealerBlackjack = False
+        self.insuranceBet = 0
+        self.evenMoney = False
         self.result = None
-        self.playerHand = []
+        self.reset_hands()
         self.dealerHand = []
+        self.dealerTotal.reset()
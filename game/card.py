@@ -1,3 +1,21 @@
+# Blackjack value of each rank; Ace is worth 11 or 1, which is resolved when scoring a hand
+RANK_VALUES = {
+    "A": 11,
+    "2": 2,
+    "3": 3,
+    "4": 4,
+    "5": 5,
+    "6": 6,
+    "7": 7,
+    "8": 8,
+    "9": 9,
+    "10": 10,
+    "J": 10,
+    "Q": 10,
+    "K": 10,
+}
+
+
 class Card:
     def __init__(self, rank, suit):
         self.rank = rank
@@ -6,19 +24,11 @@ class Card:
         self.isJack = self.rank == "J"
         self.isQueen = self.rank == "Q"
         self.isKing = self.rank == "K"
+        self.value = RANK_VALUES[rank]
 
     def get_value(self):
-        # Logic to return value: 11 for Ace and 10 for Jack, Queen, and King, int(rank) for 2-10
-        if self.isAce:
-            return 11  # Ace is worth 11 or 1 will be done in calculate_score():
-        elif self.isJack:
-            return 10
-        elif self.isQueen:
-            return 10
-        elif self.isKing:
-            return 10
-        else:
-            return int(self.rank)
+        # 11 for Ace and 10 for Jack, Queen, and King, the number for 2-10 (looked up once in __init__)
+        return self.value
 
     def __str__(self):
         return self.rank + self.suit
@@ -0,0 +1,28 @@
+# Hi-Lo card counting, updated as each card leaves the shoe
+
+# Hi-Lo tag per Card value (Ace = 11): 2-6 are +1, 7-9 are 0, tens and Aces are -1
+HILO_TAGS = (0, 0, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1)
+
+
+class HiLoCounter:
+    __slots__ = ("decks", "size", "running", "seen")
+
+    def __init__(self, decks=8):
+        self.decks = decks
+        self.size = 52 * decks
+        self.reset()
+
+    def reset(self):
+        self.running = 0
+        self.seen = 0
+
+    def observe(self, value):
+        self.running += HILO_TAGS[value]
+        self.seen += 1
+
+    def decks_remaining(self):
+        # Never divide by less than half a deck, even when a shoe is dealt very deep
+        return max(self.size - self.seen, 26) / 52
+
+    def true_count(self):
+        return self.running / self.decks_remaining()
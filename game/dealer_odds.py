@@ -0,0 +1,98 @@
+# Exact distribution of the dealer's final total for a given upcard and shoe composition
+from functools import lru_cache
+
+from game.card import RANK_VALUES
+from game.shoe import RANKS
+
+# Order of the probabilities returned by final_totals()
+OUTCOMES = (17, 18, 19, 20, 21, "bust")
+BUST = 5
+
+# A composition is a 10-tuple of card counts: index 0 holds the Aces, index 9 the ten-value cards
+
+
+def shoe_counts(decks=8):
+    counts = [0] * 10
+    for rank in RANKS:
+        counts[_index(RANK_VALUES[rank])] += 4 * decks
+    return tuple(counts)
+
+
+def counts_from_cards(cards):
+    counts = [0] * 10
+    for card in cards:
+        counts[_index(card.value)] += 1
+    return tuple(counts)
+
+
+def remove_card(counts, value):
+    i = _index(value)
+    return counts[:i] + (counts[i] - 1,) + counts[i + 1:]
+
+
+def _index(value):
+    # Card.value is 11 for an Ace
+    return 0 if value == 11 else value - 1
+
+
+@lru_cache(maxsize=None)
+def _draw_to_stand(hard, ace, counts, hit_soft17):
+    """Probabilities over OUTCOMES for a dealer holding hard total `hard` (Aces as 1)."""
+    soft = ace and hard <= 11
+    score = hard + 10 if soft else hard
+    if score > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    # Stands on all 17s like Blackjack.dealer_turn, unless hit_soft17 asks for a hit on soft 17
+    if score >= 17 and not (hit_soft17 and soft and score == 17):
+        result = [0.0] * 6
+        result[score - 17] = 1.0
+        return tuple(result)
+
+    remaining = sum(counts)
+    result = [0.0] * 6
+    for i, n in enumerate(counts):
+        if n:
+            weight = n / remaining
+            drawn = counts[:i] + (n - 1,) + counts[i + 1:]
+            for j, p in enumerate(_draw_to_stand(hard + i + 1, ace or i == 0, drawn, hit_soft17)):
+                result[j] += weight * p
+    return tuple(result)
+
+
+def final_totals(upcard, counts, no_blackjack=False, hit_soft17=False):
+    """Tuple of probabilities over OUTCOMES; `counts` must already exclude the upcard.
+
+    With no_blackjack the hole card is conditioned on not completing a natural, which
+    is the dealer a player faces once check_blackjack has settled naturals.
+    """
+    i = _index(upcard)
+    if not no_blackjack or i not in (0, 9):
+        return _draw_to_stand(i + 1, i == 0, counts, hit_soft17)
+
+    # Play out the hole card by hand so the natural-making rank can be left out
+    natural = 9 if i == 0 else 0
+    remaining = sum(counts) - counts[natural]
+    result = [0.0] * 6
+    for j, n in enumerate(counts):
+        if n and j != natural:
+            weight = n / remaining
+            drawn = counts[:j] + (n - 1,) + counts[j + 1:]
+            hole = _draw_to_stand(i + j + 2, i == 0 or j == 0, drawn, hit_soft17)
+            for k, p in enumerate(hole):
+                result[k] += weight * p
+    return tuple(result)
+
+
+def dealer_distribution(upcard, counts=None, no_blackjack=False, hit_soft17=False):
+    """Final-total distribution as a dict {17: p, ..., 21: p, "bust": p}.
+
+    `upcard` is a Card value (Ace = 11). `counts` defaults to a full 8-deck shoe
+    minus the upcard.
+    """
+    if counts is None:
+        counts = remove_card(shoe_counts(), upcard)
+    return dict(zip(OUTCOMES, final_totals(upcard, counts, no_blackjack, hit_soft17)))
+
+
+def clear_cache():
+    _draw_to_stand.cache_clear()
@@ -0,0 +1,113 @@
+# Batched gym-style environment: N independent tables advanced in lockstep with NumPy
+import numpy as np
+
+from game.rules import RuleSet
+from game.simulate import DEAL_CARDS, HandBatch, ShoeBatch
+from game.strategy import DOUBLE, HIT, STAND
+
+# Columns of the observation array
+SCORE = 0
+SOFT = 1
+UPCARD = 2
+CAN_DOUBLE = 3
+
+
+class VectorEnv:
+    """reset(n) / step(actions) over n tables, each with its own shoe.
+
+    Observations are an (n, 4) int16 array of player score, soft flag, dealer upcard
+    (Card value, Ace = 11) and whether doubling is allowed. Actions are STAND, HIT or
+    DOUBLE from game.strategy (DOUBLE past the first decision counts as HIT); splits
+    and surrender are not modelled here and step() rejects them. A finished table is dealt a new round at
+    once. Rounds settled on a natural at the deal need no action, so their result is
+    added to that table's next reward and they are counted in self.naturals.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else RuleSet()
+        self.dealer_hits = np.array(self.rules.dealer_hits, dtype=bool)
+        self.lanes = 0
+
+    def reset(self, n, seed=None):
+        self.lanes = n
+        self.shoe = ShoeBatch(n, self.rules, seed)
+        self.player = HandBatch(n)
+        self.dealer = HandBatch(n)
+        self.upcard = np.zeros(n, dtype=np.int16)
+        self.cards = np.zeros(n, dtype=np.int16)
+        self.wager = np.ones(n, dtype=np.int16)
+        self.pending = np.zeros(n)
+        self.naturals = np.zeros(n, dtype=np.int64)
+        self._deal(np.ones(n, dtype=bool))
+        return self._observe()
+
+    def step(self, actions):
+        """Apply one action per table; returns (observations, rewards, dones)."""
+        actions = np.asarray(actions)
+        unsupported = (actions != STAND) & (actions != HIT) & (actions != DOUBLE)
+        if unsupported.any():
+            code = actions[unsupported].flat[0]
+            raise ValueError(f"unsupported action {code}; use STAND, HIT or DOUBLE")
+        first = self.cards == 2
+        doubling = (actions == DOUBLE) & first
+        drawing = (actions == HIT) | (actions == DOUBLE)
+        rewards = self.pending.copy()
+        self.pending[:] = 0
+
+        if drawing.any():
+            self.shoe.check(drawing)
+            self.player.add(self.shoe.draw(drawing))
+            self.cards += drawing
+        self.wager[doubling] = 2
+
+        busted = drawing & (self.player.score > 21)
+        rewards[busted] -= self.wager[busted]
+        standing = ((actions == STAND) | doubling) & ~busted
+        if standing.any():
+            self._dealer_turn(standing, rewards)
+
+        done = busted | standing
+        self._deal(done)
+        return self._observe(), rewards, done
+
+    def _deal(self, mask):
+        # Same order as Blackjack.deal_cards; tables that hit a natural are redealt
+        payout = self.rules.blackjack_payout
+        while mask.any():
+            self.shoe.check(mask, DEAL_CARDS)
+            self.player.reset(mask)
+            self.dealer.reset(mask)
+            self.player.add(self.shoe.draw(mask))
+            upcard = self.shoe.draw(mask)
+            self.dealer.add(upcard)
+            self.upcard[mask] = upcard[mask]
+            self.player.add(self.shoe.draw(mask))
+            self.dealer.add(self.shoe.draw(mask))
+            self.cards[mask] = 2
+            self.wager[mask] = 1
+
+            player_natural = mask & (self.player.score == 21)
+            dealer_natural = mask & (self.dealer.score == 21)
+            self.pending[player_natural & ~dealer_natural] += payout
+            self.pending[dealer_natural & ~player_natural] -= 1
+            mask = player_natural | dealer_natural
+            self.naturals += mask
+
+    def _dealer_turn(self, mask, rewards):
+        drawing = mask & self.dealer_hits[self.dealer.score * 2 + self.dealer.soft]
+        while drawing.any():
+            self.shoe.check(drawing)
+            self.dealer.add(self.shoe.draw(drawing))
+            drawing &= self.dealer_hits[self.dealer.score * 2 + self.dealer.soft]
+
+        player_score = self.player.score
+        dealer_score = self.dealer.score
+        won = mask & ((dealer_score > 21) | (player_score > dealer_score))
+        lost = mask & (dealer_score <= 21) & (player_score < dealer_score)
+        rewards[won] += self.wager[won]
+        rewards[lost] -= self.wager[lost]
+
+    def _observe(self):
+        return np.stack(
+            (self.player.score, self.player.soft, self.upcard, self.cards == 2), axis=1
+        ).astype(np.int16)
@@ -0,0 +1,39 @@
+# Running hand totals, updated per card instead of rescanning the hand
+
+
+class HandTotal:
+    """Hard total (every Ace counted as 1) plus the number of Aces in the hand."""
+
+    __slots__ = ("hard", "aces", "score", "soft", "cards")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hard = 0
+        self.aces = 0
+        self.score = 0
+        self.soft = False
+        self.cards = 0
+
+    def add(self, value):
+        # value is Card.value, so an Ace arrives as 11
+        if value == 11:
+            self.hard += 1
+            self.aces += 1
+        else:
+            self.hard += value
+        self.cards += 1
+        # At most one Ace can ever count as 11 without busting
+        self.soft = self.aces > 0 and self.hard <= 11
+        self.score = self.hard + 10 if self.soft else self.hard
+        return self.score
+
+    def state(self):
+        return (self.hard, self.aces, self.score, self.soft, self.cards)
+
+    def restore(self, state):
+        self.hard, self.aces, self.score, self.soft, self.cards = state
+
+    def is_blackjack(self):
+        return self.cards == 2 and self.score == 21
@@ -0,0 +1,139 @@
+# Exact expected value of a strategy table under a rule set, by enumerating hand trees
+from game.dealer_odds import remove_card, shoe_counts
+from game.rules import RuleSet
+from game.solver import clear_cache, draws, hand_score, stand_ev
+from game.strategy import (
+    DOUBLE,
+    HIT,
+    HIT_STAND,
+    MAY_DOUBLE,
+    MAY_SURRENDER,
+    SPLIT,
+    SURRENDER,
+    Strategy,
+)
+
+VALUES = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10)  # Card value of each composition index
+
+
+class HouseEdge:
+    """Expected value per initial unit of playing `strategy` (a game.strategy.Strategy)
+    from a full shoe, with every deal and every card drawn weighted by the composition.
+
+    The dealer side comes from game.dealer_odds with naturals settled first, as in
+    Blackjack.check_blackjack. As in game.solver, a split is two copies of one split
+    hand played from the same composition, without resplits, and player draws are
+    not conditioned on the dealer's hole card. Insurance and even money are declined,
+    like Strategy.play does.
+    """
+
+    def __init__(self, rules=None, strategy=None):
+        self.rules = rules if rules is not None else RuleSet()
+        self.strategy = strategy if strategy is not None else Strategy.solved(self.rules)
+        self.hit_soft17 = self.rules.hit_soft17
+        self.memo = {}
+
+    def _play(self, hard, ace, options, pair, upcard, counts):
+        """EV of a hand (Aces counted as 1 in hard) played on by the strategy."""
+        key = (hard, ace, options, pair, upcard, counts)
+        ev = self.memo.get(key)
+        if ev is not None:
+            return ev
+        score = hand_score(hard, ace)
+        soft = int(ace and hard <= 11)
+        code = self.strategy.action(score, soft, pair, options, upcard)
+        if code == HIT:
+            ev = 0.0
+            for p, value, drawn in draws(counts):
+                new_hard = hard + value
+                new_ace = ace or value == 1
+                if hand_score(new_hard, new_ace) > 21:
+                    ev -= p
+                else:
+                    ev += p * self._play(new_hard, new_ace, HIT_STAND, 0, upcard, drawn)
+        elif code == DOUBLE:
+            ev = 0.0
+            for p, value, drawn in draws(counts):
+                new_score = hand_score(hard + value, ace or value == 1)
+                ev += p * 2 * stand_ev(new_score, upcard, drawn, self.hit_soft17)
+        elif code == SPLIT:
+            ev = self._split(pair, upcard, counts)
+        elif code == SURRENDER:
+            ev = -0.5
+        else:
+            ev = stand_ev(score, upcard, counts, self.hit_soft17)
+        self.memo[key] = ev
+        return ev
+
+    def _split(self, value, upcard, counts):
+        first = 1 if value == 11 else value
+        options = MAY_DOUBLE if self.rules.double_after_split else HIT_STAND
+        ev = 0.0
+        for p, second, drawn in draws(counts):
+            hard = first + second
+            ace = first == 1 or second == 1
+            if first == 1:
+                # Split Aces get one card each and stand
+                ev += p * stand_ev(hand_score(hard, ace), upcard, drawn, self.hit_soft17)
+            else:
+                ev += p * self._play(hard, ace, options, 0, upcard, drawn)
+        return 2 * ev
+
+    def _round(self, first, second, upcard, counts):
+        """EV of a dealt round; counts already exclude both player cards and the upcard."""
+        # Chance the hole card completes a dealer natural
+        if upcard == 11:
+            peek = counts[9] / sum(counts)
+        elif upcard == 10:
+            peek = counts[0] / sum(counts)
+        else:
+            peek = 0.0
+        if first + second == 21:
+            return (1 - peek) * self.rules.blackjack_payout
+        hard = (1 if first == 11 else first) + (1 if second == 11 else second)
+        ace = first == 11 or second == 11
+        options = MAY_SURRENDER if self.rules.surrender else MAY_DOUBLE
+        pair = first if first == second and self.rules.max_hands > 1 else 0
+        return -peek + (1 - peek) * self._play(hard, ace, options, pair, upcard, counts)
+
+    def expected_value(self):
+        """EV per initial unit; the house edge is its negative.
+
+        The hand and dealer memos reach millions of entries, so they only live for one call.
+        """
+        try:
+            return self._expected_value()
+        finally:
+            self.memo.clear()
+            clear_cache()
+
+    def _expected_value(self):
+        counts = shoe_counts(self.rules.decks)
+        total = sum(counts)
+        ev = 0.0
+        # Deal order as in Blackjack.deal_cards: player, dealer upcard, player
+        for i, first in enumerate(VALUES):
+            p1 = counts[i] / total
+            after_first = remove_card(counts, first)
+            for j, upcard in enumerate(VALUES):
+                p2 = p1 * after_first[j] / (total - 1)
+                after_up = remove_card(after_first, upcard)
+                for k, second in enumerate(VALUES):
+                    if after_up[k]:
+                        p3 = p2 * after_up[k] / (total - 2)
+                        ev += p3 * self._round(first, second, upcard, remove_card(after_up, second))
+        return ev
+
+
+def house_edge(rules=None, strategy=None):
+    """House edge (positive when the house wins) of a strategy, by default the solved chart."""
+    return -HouseEdge(rules, strategy).expected_value()
+
+
+def main():
+    rules = RuleSet()
+    print(f"{rules}: house edge {house_edge(rules):.4%}")
+
+
+if __name__ == "__main__":
+    main()
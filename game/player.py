@@ -1,3 +1,6 @@
+from game.stats import RoundStats
+
+
 class Player:
     def __init__(self, name="Player", chips=1000):
         self.name = name
@@ -7,6 +10,8 @@ class Player:
         self.wins = 0
         self.losses = 0
         self.draws = 0
+        # Net result of every settled round, in units of that round's bet
+        self.stats = RoundStats()
         
     def place_bet(self, amount):
         if amount <= self.chips:
@@ -15,6 +20,10 @@ class Player:
             return True
         return False
     
+    def place_count_bet(self, ramp, true_count):
+        # Bot betting: the game.betting.BetRamp wager for this count, capped at the chips
+        return self.place_bet(ramp.wager(true_count, self.chips))
+
     def win_bet(self, multiplier=1):
         winnings = self.current_bet * (1 + multiplier)
         self.chips += winnings
@@ -30,14 +39,35 @@ class Player:
         self.draws += 1
         self.current_bet = 0
         
+    def can_cover(self, units=1):
+        # Enough chips left to add `units` more of the current bet (a double or a split)
+        return self.chips >= self.current_bet * units
+
+    def settle_bet(self, net, result, blackjack=False):
+        # net is Blackjack.settle(): the round's result in units of the current bet
+        self.chips += self.current_bet * (1 + net)
+        self.stats.add(net, result, blackjack)
+        if result == "win":
+            self.wins += 1
+        elif result in ("lose", "surrender"):
+            self.losses += 1
+        else:
+            self.draws += 1
+        self.current_bet = 0
+        
     def get_stats(self):
         total_games = self.wins + self.losses + self.draws
         if total_games == 0:
             return {"games": 0, "win_rate": 0}
-        return {
+        stats = {
             "games": total_games,
             "wins": self.wins,
             "losses": self.losses,
             "draws": self.draws,
             "win_rate": round(self.wins / total_games * 100, 2)
         }
+        if self.stats.rounds:
+            # Only rounds settled through settle_bet carry a net result
+            stats["ev"] = self.stats.mean
+            stats["ev_ci"] = self.stats.confidence_interval()
+        return stats
@@ -0,0 +1,143 @@
+# Opt-in call counts and timings for Blackjack methods, dumped as JSON or folded stacks
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from game.blackjack import Blackjack
+
+METHODS = (
+    "start_game",
+    "reset_game",
+    "deal_cards",
+    "create_deck",
+    "shuffle_deck",
+    "check_deck",
+    "draw_card",
+    "calculate_score",
+    "open_round",
+    "check_blackjack",
+    "hit",
+    "stand",
+    "next_hand",
+    "split",
+    "double_down",
+    "surrender",
+    "dealer_turn",
+    "determine_winner",
+    "settle",
+)
+
+_originals = {}  # (class, name) -> the unwrapped function, while enabled
+_local = threading.local()
+_tables = []  # every thread's table; each is only written by its own thread
+
+
+def _thread_table():
+    table = getattr(_local, "table", None)
+    if table is None:
+        # name -> [calls, total ns, self ns]; stacks: tuple of names -> self ns
+        table = _local.table = {"methods": {}, "stacks": {}}
+        _local.stack = []
+        _local.children = []
+        _tables.append(table)
+    return table
+
+
+def _wrap(owner, name, func):
+    label = f"{owner.__name__}.{name}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        table = _thread_table()
+        stack = _local.stack
+        children = _local.children
+        stack.append(label)
+        children.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self_ns = elapsed - children.pop()
+            path = tuple(stack)
+            stack.pop()
+            if children:
+                children[-1] += elapsed
+            counts = table["methods"].get(label)
+            if counts is None:
+                counts = table["methods"][label] = [0, 0, 0]
+            counts[0] += 1
+            counts[1] += elapsed
+            counts[2] += self_ns
+            table["stacks"][path] = table["stacks"].get(path, 0) + self_ns
+
+    return wrapper
+
+
+def enable(methods=METHODS, cls=Blackjack):
+    """Replace the methods on cls with timing wrappers until disable() is called."""
+    for name in methods:
+        if (cls, name) not in _originals:
+            func = cls.__dict__[name]
+            _originals[(cls, name)] = func
+            setattr(cls, name, _wrap(cls, name, func))
+
+
+def disable():
+    # Put the original functions back, so a disabled profiler costs nothing
+    for (cls, name), func in _originals.items():
+        setattr(cls, name, func)
+    _originals.clear()
+
+
+def enabled():
+    return bool(_originals)
+
+
+@contextmanager
+def profiled(methods=METHODS, cls=Blackjack):
+    enable(methods, cls)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def reset():
+    for table in _tables:
+        table["methods"].clear()
+        table["stacks"].clear()
+
+
+def results():
+    """Totals over all threads: {method: {"calls", "total_ns", "self_ns"}}."""
+    merged = {}
+    for table in list(_tables):
+        for label, (calls, total, own) in list(table["methods"].items()):
+            entry = merged.setdefault(label, {"calls": 0, "total_ns": 0, "self_ns": 0})
+            entry["calls"] += calls
+            entry["total_ns"] += total
+            entry["self_ns"] += own
+    return dict(sorted(merged.items(), key=lambda item: -item[1]["total_ns"]))
+
+
+def folded():
+    """Self time per call stack in the folded format flamegraph.pl and speedscope read."""
+    stacks = {}
+    for table in list(_tables):
+        for path, ns in list(table["stacks"].items()):
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0) + ns
+    return "".join(f"{key} {ns}\n" for key, ns in sorted(stacks.items()))
+
+
+def dump_json(path):
+    with open(path, "w") as f:
+        json.dump(results(), f, indent=2)
+
+
+def dump_folded(path):
+    with open(path, "w") as f:
+        f.write(folded())
@@ -0,0 +1,220 @@
+# Append-only binary log of played rounds, and a replayer that re-deals them exactly
+import random
+import struct
+import sys
+import zlib
+from collections import namedtuple
+
+from game.blackjack import Blackjack
+from game.rules import RuleSet
+from game.shoe import Shoe
+
+MAGIC = b"BJRL"
+VERSION = 1
+
+# Header after MAGIC: version, decks, h17, das, ls, max_hands, insurance, penetration, bj payout
+HEADER = struct.Struct("<7B2d")
+# Round: shoe seed, shoe position after the deal's check_deck, crc32 of the shoe order,
+# then the number of actions; the action bytes follow, then OUTCOME
+ROUND = struct.Struct("<QHIB")
+OUTCOME = struct.Struct("<Bd")  # result code, net from Blackjack.settle()
+
+ACTIONS = ("hit", "stand", "double", "split", "surrender", "insurance", "decline", "even_money")
+RESULTS = ("win", "lose", "draw", "surrender")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+RESULT_CODES = {name: code for code, name in enumerate(RESULTS)}
+
+RoundRecord = namedtuple("RoundRecord", ["seed", "pos", "crc", "actions", "result", "net"])
+
+
+class ShuffleSeeds:
+    """A Shoe rng whose shuffles are all reproducible from the seed of the current shoe.
+
+    Every shuffle uses its own 64-bit seed, and the next seed is the first draw of the
+    same generator, so a mid-round reshuffle can be replayed from the round's seed alone.
+    """
+
+    def __init__(self, seed=None):
+        self.next = seed if seed is not None else random.getrandbits(64)
+        self.seed = None
+
+    def shuffle(self, cards):
+        self.seed = self.next
+        rng = random.Random(self.seed)
+        self.next = rng.getrandbits(64)
+        rng.shuffle(cards)
+
+    def getstate(self):
+        return self.seed, self.next
+
+    def setstate(self, state):
+        self.seed, self.next = state
+
+    def resume(self, seed):
+        # As if the shoe dealt from now on had just been shuffled with seed
+        self.seed = seed
+        self.next = random.Random(seed).getrandbits(64)
+
+
+def _pack_rules(rules):
+    return MAGIC + HEADER.pack(
+        VERSION,
+        rules.decks,
+        rules.hit_soft17,
+        rules.double_after_split,
+        rules.surrender,
+        rules.max_hands,
+        rules.insurance,
+        rules.penetration,
+        rules.blackjack_payout,
+    )
+
+
+def _unpack_rules(data):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a replay log")
+    version, decks, h17, das, ls, max_hands, ins, penetration, payout = HEADER.unpack(
+        data[len(MAGIC):]
+    )
+    if version != VERSION:
+        raise ValueError(f"unsupported replay log version {version}")
+    return RuleSet(decks, h17, penetration, das, ls, payout, max_hands, ins)
+
+
+class Recorder:
+    """Writes every round a Blackjack plays to an append-only log.
+
+    attach() installs a ShuffleSeeds on the game's Shoe, discards whatever is left in
+    the shoe and sets game.recorder, so call it between rounds. From then on the engine
+    reports each deal, action and finished round. A round that is abandoned before it
+    finishes is not written.
+    """
+
+    def __init__(self, path, rules=None, seed=None):
+        self.rules = rules if rules is not None else RuleSet()
+        self.rng = ShuffleSeeds(seed)
+        self.file = open(path, "ab")
+        header = _pack_rules(self.rules)
+        if self.file.tell() == 0:
+            self.file.write(header)
+        else:
+            with open(path, "rb") as f:
+                if f.read(len(header)) != header:
+                    self.file.close()
+                    raise ValueError("replay log was recorded with different rules")
+        self.crcSeed = None
+        self.crc = 0
+        self.round = None
+        self.actions = bytearray()
+
+    def attach(self, game):
+        if game.shoe is None or game.shoe.continuous:
+            raise ValueError("recording needs a shuffled game.shoe.Shoe backend")
+        if game.rules.key() != self.rules.key():
+            raise ValueError("game rules do not match the log")
+        game.shoe.rng = self.rng
+        # Empty the shoe so the next deal reshuffles it with ShuffleSeeds; a shoe
+        # shuffled by another rng has no seed to record
+        game.shoe.pos = game.shoe.size
+        game.recorder = self
+        return game
+
+    def begin(self, game):
+        seed = self.rng.seed
+        # The order only changes on a reshuffle, so hash it once per shoe
+        if seed != self.crcSeed:
+            self.crcSeed = seed
+            self.crc = zlib.crc32(game.shoe.cards)
+        self.round = (seed, game.shoe.pos, self.crc)
+        self.actions.clear()
+
+    def action(self, name):
+        self.actions.append(ACTION_CODES[name])
+
+    def end(self, game):
+        if self.round is None:
+            return
+        self.file.write(ROUND.pack(*self.round, len(self.actions)))
+        self.file.write(self.actions)
+        self.file.write(OUTCOME.pack(RESULT_CODES[game.result], game.settle()))
+        self.round = None
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_log(path):
+    """Return (rules, records) for a log; records is a list of RoundRecord."""
+    with open(path, "rb") as f:
+        data = f.read()
+    start = len(MAGIC) + HEADER.size
+    rules = _unpack_rules(data[:start])
+    records = []
+    pos = start
+    while pos < len(data):
+        seed, shoe_pos, crc, count = ROUND.unpack_from(data, pos)
+        pos += ROUND.size
+        actions = data[pos:pos + count]
+        pos += count
+        result, net = OUTCOME.unpack_from(data, pos)
+        pos += OUTCOME.size
+        records.append(RoundRecord(seed, shoe_pos, crc, actions, RESULTS[result], net))
+    return rules, records
+
+
+def replay_round(game, record):
+    """Re-deal one recorded round on a game built by replay_game(); returns True if the
+    shoe order and the outcome both match the record."""
+    shoe = game.shoe
+    if shoe.rng.seed != record.seed:
+        shoe.rng.next = record.seed
+        shoe.build()
+        shoe.shuffle()
+        if zlib.crc32(shoe.cards) != record.crc:
+            return False
+    else:
+        # Same shoe as the last round; only the chained seed has to be rewound
+        shoe.rng.resume(record.seed)
+    shoe.pos = record.pos
+    game.start_game()
+    for code in record.actions:
+        name = ACTIONS[code]
+        if name == "insurance":
+            game.insurance(True)
+        elif name == "decline":
+            game.insurance(False)
+        elif name == "double":
+            game.double_down()
+        else:
+            getattr(game, name)()
+    return game.gameOver and game.result == record.result and game.settle() == record.net
+
+
+def replay_game(rules):
+    return Blackjack(Shoe(rules.decks, ShuffleSeeds()), rules=rules)
+
+
+def replay(path):
+    """Replay every round in a log; returns (rounds, indexes of rounds that differ)."""
+    rules, records = read_log(path)
+    game = replay_game(rules)
+    mismatches = [i for i, record in enumerate(records) if not replay_round(game, record)]
+    return len(records), mismatches
+
+
+def main():
+    for path in sys.argv[1:]:
+        rounds, mismatches = replay(path)
+        print(f"{path}: {rounds} rounds replayed, {len(mismatches)} mismatches")
+        for i in mismatches[:20]:
+            print(f"  round {i}")
+
+
+if __name__ == "__main__":
+    main()
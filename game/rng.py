@@ -0,0 +1,102 @@
+# NumPy shuffle backend for Blackjack/Shoe: whole shoe permutations generated in bulk
+import queue
+import threading
+
+import numpy as np
+
+
+class NumpyShuffler:
+    """A drop-in rng for Blackjack(rng=...) or Shoe(rng=...) backed by a PCG64 Generator.
+
+    size is the full shoe (RuleSet.cards); its permutations are generated `batch` at a
+    time. With prefetch > 0 a thread keeps that many batches queued ahead, so a
+    reshuffle only copies a ready permutation; call close(), or use the shuffler as a
+    context manager, to stop it once the game is done. The sequence depends only on the
+    seed, with or without prefetching and before or after close(). A partial reshuffle
+    of a Shoe (a memoryview of the cards still in it) draws from a second stream so it
+    never races the thread; any other length is a shoe of the wrong size and raises
+    ValueError.
+    """
+
+    shuffles_buffers = True  # a Shoe hands over its array('B') buffer, not a list
+
+    def __init__(self, size, seed=None, batch=64, prefetch=0):
+        self.size = size
+        self.batch = batch
+        self.generator, self.spare = np.random.default_rng(seed).spawn(2)
+        self.identity = np.broadcast_to(np.arange(size, dtype=np.intp), (batch, size))
+        self.rows = None
+        self.row = batch
+        self.queue = None
+        self.thread = None
+        self.pending = []  # batches prefetched before close(), in order
+        if prefetch:
+            self.queue = queue.Queue(maxsize=prefetch)
+            self.stop = threading.Event()
+            self.held = None
+            self.thread = threading.Thread(target=self._fill, daemon=True)
+            self.thread.start()
+
+    def _permutations(self):
+        return self.generator.permuted(self.identity, axis=1)
+
+    def _fill(self):
+        # put() times out so a full queue still notices close(); a batch that could not
+        # be queued is left in self.held for close() to keep
+        while not self.stop.is_set():
+            self.held = self._permutations()
+            while not self.stop.is_set():
+                try:
+                    self.queue.put(self.held, timeout=0.05)
+                except queue.Full:
+                    continue
+                self.held = None
+                break
+
+    def close(self):
+        """Stop the prefetch thread; later shuffles generate their batches inline."""
+        if self.thread is None:
+            return
+        self.stop.set()
+        self.thread.join()
+        self.thread = None
+        while not self.queue.empty():
+            self.pending.append(self.queue.get_nowait())
+        if self.held is not None:
+            self.pending.append(self.held)
+            self.held = None
+        self.queue = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def permutation(self):
+        if self.row == self.batch:
+            if self.pending:
+                self.rows = self.pending.pop(0)
+            elif self.queue is not None:
+                self.rows = self.queue.get()
+            else:
+                self.rows = self._permutations()
+            self.row = 0
+        order = self.rows[self.row]
+        self.row += 1
+        return order
+
+    def shuffle(self, cards):
+        n = len(cards)
+        if n == self.size:
+            order = self.permutation()
+        elif isinstance(cards, memoryview) and n < self.size:
+            order = self.spare.permutation(n)
+        else:
+            raise ValueError(f"NumpyShuffler was built for {self.size} cards, not {n}")
+        if isinstance(cards, list):
+            cards[:] = [cards[i] for i in order.tolist()]
+        else:
+            # array('B') shoes and memoryview slices of them are shuffled in place
+            view = np.frombuffer(cards, dtype=np.uint8)
+            view[:] = view[order]
@@ -0,0 +1,73 @@
+# Table rules, validated once and compiled into the constants the engine reads
+
+
+class RuleSet:
+    """House rules for a Blackjack table.
+
+    penetration is the fraction of the shoe dealt before check_deck reshuffles; the
+    default 0.4 reproduces the original DECK_THRESHOLD of int(416 * 0.6) cards left.
+    blackjack_payout is what a natural wins per unit bet (1.5 for 3:2).
+    max_hands caps how many hands resplitting can make; split Aces get one card each.
+    surrender allows late surrender (after naturals are settled); insurance offers
+    insurance or even money against a dealer Ace before naturals are settled.
+    """
+
+    def __init__(
+        self,
+        decks=8,
+        hit_soft17=False,
+        penetration=0.4,
+        double_after_split=True,
+        surrender=False,
+        blackjack_payout=1.5,
+        max_hands=4,
+        insurance=False,
+    ):
+        if not isinstance(decks, int) or decks < 1:
+            raise ValueError("decks must be a positive whole number")
+        if not 0 < penetration < 1:
+            raise ValueError("penetration must be between 0 and 1")
+        if blackjack_payout <= 0:
+            raise ValueError("blackjack_payout must be positive")
+        if not isinstance(max_hands, int) or max_hands < 1:
+            raise ValueError("max_hands must be a positive whole number")
+
+        self.decks = decks
+        self.hit_soft17 = bool(hit_soft17)
+        self.penetration = penetration
+        self.double_after_split = bool(double_after_split)
+        self.surrender = bool(surrender)
+        self.blackjack_payout = blackjack_payout
+        self.max_hands = max_hands
+        self.insurance = bool(insurance)
+
+        # Compiled tables: the hot path indexes these instead of testing the options
+        self.cards = 52 * decks
+        self.threshold = int(self.cards * (1 - penetration))
+        # Settlement table: net result per unit wagered for each outcome; insurance is
+        # per unit of the side bet, even money per unit of the main bet
+        self.payouts = {
+            "win": 1,
+            "lose": -1,
+            "draw": 0,
+            "surrender": -0.5,
+            "insurance": 2,
+            "even_money": 1,
+        }
+        # dealer_hits[score * 2 + soft] is True while the dealer must draw
+        self.dealer_hits = tuple(
+            score < 17 or (self.hit_soft17 and soft == 1 and score == 17)
+            for score in range(32)
+            for soft in (0, 1)
+        )
+
+    def key(self):
+        """Stable text form of the rules, e.g. for labelling simulation results."""
+        return (
+            f"decks={self.decks},h17={int(self.hit_soft17)},pen={self.penetration},"
+            f"das={int(self.double_after_split)},ls={int(self.surrender)},"
+            f"bj={self.blackjack_payout},mh={self.max_hands},ins={int(self.insurance)}"
+        )
+
+    def __repr__(self):
+        return f"RuleSet({self.key()})"
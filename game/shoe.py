@@ -0,0 +1,123 @@
+# Compact shoe backend: cards are stored as one byte each instead of Card objects
+import random
+from array import array
+
+from game.card import Card
+
+RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+SUITS = ("C", "D", "H", "S")
+
+# A card code is rank_index * 4 + suit_index, so one deck is range(52)
+DECK_CODES = array("B", range(len(RANKS) * len(SUITS)))
+
+# Card objects are only needed at the GUI/CLI boundary; every code maps to one
+# shared, never-mutated Card so decoding a draw allocates nothing
+CARDS = tuple(Card(rank, suit) for rank in RANKS for suit in SUITS)
+_SUIT_MAJOR = [rank * 4 + suit for suit in range(len(SUITS)) for rank in range(len(RANKS))]
+
+
+# A full shoe in Blackjack.create_deck's suit-major order, as shared Card objects
+def shoe_cards(decks=8):
+    return tuple(CARDS[code] for code in _SUIT_MAJOR) * decks
+
+
+def card_from_code(code):
+    return CARDS[code]
+
+
+def code_from_card(card):
+    return RANKS.index(card.rank) * 4 + SUITS.index(card.suit)
+
+
+class Shoe:
+    """A fixed-size shoe buffer that is refilled from an immutable template.
+
+    Cards are drawn from a read position instead of popped, so a reshuffle is a
+    copy of the template into the same buffer plus an in-place shuffle. Drawing never
+    writes to the buffer, so snapshots share it; it is only copied when a shared
+    buffer is about to be rebuilt or shuffled.
+    """
+
+    continuous = False  # see ContinuousShoe
+
+    def __init__(self, decks=8, rng=None):
+        self.decks = decks
+        self.rng = rng if rng is not None else random
+        self.size = len(DECK_CODES) * decks
+        self.template = bytes(DECK_CODES * decks)
+        self.cards = array("B", self.template)
+        self.pos = self.size  # starts empty, like Blackjack.deck
+        self.shared = False  # True while a snapshot may still reference self.cards
+
+    def __len__(self):
+        return self.size - self.pos
+
+    def build(self):
+        if self.shared:
+            self.cards = array("B", self.template)
+            self.shared = False
+        else:
+            memoryview(self.cards)[:] = self.template
+        self.pos = 0
+
+    def shuffle(self):
+        if self.pos == self.size:
+            self.build()
+        if self.shared:
+            self.cards = array("B", self.cards)
+            self.shared = False
+        # Only the cards still in the shoe get mixed
+        view = memoryview(self.cards)[self.pos:]
+        if getattr(self.rng, "shuffles_buffers", False):
+            self.rng.shuffle(view)
+        else:
+            # random.shuffle boxes every item it reads from an array; a list of small
+            # ints shuffles faster and ends up in the same order
+            cards = view.tolist()
+            self.rng.shuffle(cards)
+            view[:] = bytes(cards)
+
+    def snapshot(self):
+        self.shared = True
+        return self.cards, self.pos
+
+    def restore(self, snapshot):
+        self.cards, self.pos = snapshot
+        self.shared = True
+
+    def draw(self):
+        card = self.cards[self.pos]
+        self.pos += 1
+        return card
+
+
+class ContinuousShoe(Shoe):
+    """A continuous shuffling machine: every draw is a uniform pick from the cards in the
+    machine, and Blackjack hands the discards back with collect() before each deal.
+
+    The buffer layout matches Shoe (cards[pos:] are in the machine), so a draw is a
+    swap of the picked card to the read position. A collect() just rewinds pos; nothing
+    else refills the machine, and drawing from an empty one raises ValueError. The rng
+    needs randrange(), e.g. random.Random(seed).
+    """
+
+    continuous = True
+
+    def collect(self):
+        self.pos = 0
+
+    def draw(self):
+        if self.shared:
+            # Draws swap cards in the buffer, so a snapshot's copy must not see them
+            self.cards = array("B", self.cards)
+            self.shared = False
+        cards = self.cards
+        pos = self.pos
+        if pos == self.size:
+            raise ValueError("continuous shuffler is empty; collect() the discards first")
+        i = self.rng.randrange(pos, self.size)
+        card = cards[i]
+        cards[i] = cards[pos]
+        cards[pos] = card
+        self.pos = pos + 1
+        return card
@@ -0,0 +1,249 @@
+# Vectorized Monte Carlo rounds: every lane is an independent table with its own shoe
+import numpy as np
+
+from game.betting import HIGH_COUNT, LOW_COUNT
+from game.card import RANK_VALUES
+from game.count import HILO_TAGS
+from game.rules import RuleSet
+from game.shoe import RANKS, SUITS
+from game.stats import RoundStats
+from game.strategy import HIT, HIT_STAND, table_index
+
+WIN = 1
+LOSE = -1
+DRAW = 0
+
+# Card values of one deck; the simulator never needs suits or Card objects
+DECK_VALUES = np.array([RANK_VALUES[rank] for rank in RANKS for suit in SUITS], dtype=np.uint8)
+# Hi-Lo tag per card value; value 0 (a masked-out draw) tags as 0
+TAGS = np.array(HILO_TAGS, dtype=np.int16)
+DEAL_CARDS = 4  # player, dealer, player, dealer
+
+
+class ShoeBatch:
+    """One shoe per lane, reshuffled per lane with the same threshold as Blackjack.check_deck.
+
+    Each lane also keeps a Hi-Lo running count, like a game.count.HiLoCounter on the engine.
+    """
+
+    def __init__(self, lanes, rules=None, rng=None):
+        self.rules = rules if rules is not None else RuleSet()
+        self.rng = np.random.default_rng(rng)
+        self.lanes = lanes
+        self.template = np.tile(DECK_VALUES, self.rules.decks)
+        self.size = len(self.template)
+        self.threshold = self.rules.threshold
+        self.cards = np.empty((lanes, self.size), dtype=np.uint8)
+        self.pos = np.zeros(lanes, dtype=np.intp)
+        self.running = np.zeros(lanes, dtype=np.int16)
+        self.index = np.arange(lanes)
+        self.reshuffle(np.ones(lanes, dtype=bool))
+
+    def reshuffle(self, mask):
+        lanes = np.flatnonzero(mask)
+        if lanes.size:
+            shoes = np.broadcast_to(self.template, (lanes.size, self.size))
+            self.cards[lanes] = self.rng.permuted(shoes, axis=1)
+            self.pos[lanes] = 0
+            self.running[lanes] = 0
+
+    def check(self, mask=None, cards=1):
+        """Reshuffle lanes at the threshold, or with fewer than `cards` left to draw."""
+        left = self.size - self.pos
+        low = (left <= self.threshold) | (left < cards)
+        if mask is not None:
+            low &= mask
+        if low.any():
+            self.reshuffle(low)
+
+    def draw(self, mask=None):
+        """Pop one card from every lane (or every lane in mask); other lanes read as 0."""
+        if mask is None:
+            assert (self.pos < self.size).all(), "draw from an empty shoe; check() first"
+            values = self.cards[self.index, self.pos]
+            self.pos += 1
+        else:
+            assert (self.pos[mask] < self.size).all(), "draw from an empty shoe; check() first"
+            # Masked-out lanes may sit at the end of their shoe; their read is discarded
+            read = np.where(mask, self.pos, np.minimum(self.pos, self.size - 1))
+            values = self.cards[self.index, read]
+            self.pos += mask
+            values = np.where(mask, values, 0)
+        self.running += TAGS[values]
+        return values
+
+    def true_count(self):
+        # Same floor of half a deck as HiLoCounter.decks_remaining
+        return self.running / (np.maximum(self.size - self.pos, 26) / 52)
+
+
+def ramp_wagers(ramp, true_counts):
+    """Vectorized game.betting.BetRamp.wager: one table lookup per lane."""
+    index = np.clip(np.floor(true_counts), LOW_COUNT, HIGH_COUNT).astype(np.intp) - LOW_COUNT
+    return np.asarray(ramp.table, dtype=float)[index]
+
+
+class HandBatch:
+    """Hard total plus Ace count per lane, the array form of game.hand.HandTotal."""
+
+    def __init__(self, lanes):
+        self.hard = np.zeros(lanes, dtype=np.int16)
+        self.aces = np.zeros(lanes, dtype=np.int16)
+
+    def reset(self, mask):
+        self.hard[mask] = 0
+        self.aces[mask] = 0
+
+    def add(self, values):
+        aces = values == 11
+        self.hard += np.where(aces, 1, values)
+        self.aces += aces
+
+    @property
+    def soft(self):
+        return (self.aces > 0) & (self.hard <= 11)
+
+    @property
+    def score(self):
+        return self.hard + 10 * self.soft
+
+
+def play_round(shoe, stand_on=17, strategy=None):
+    """Play one round on every lane of shoe; returns (outcome, net units, natural flags).
+
+    The player hits below stand_on, or wherever a game.strategy.Strategy says HIT. The
+    chart is read with the HIT_STAND option and no pair, so "D"/"Rh" cells hit, "Ds"/"Rs"
+    cells stand, and pairs are played from their hard or soft total row.
+    """
+    rules = shoe.rules
+    dealer_hits = np.array(rules.dealer_hits, dtype=bool)
+    lanes = shoe.lanes
+    player = HandBatch(lanes)
+    dealer = HandBatch(lanes)
+
+    # deal_cards: one check, then player, dealer, player, dealer
+    shoe.check(cards=DEAL_CARDS)
+    player.add(shoe.draw())
+    upcard = shoe.draw()
+    dealer.add(upcard)
+    player.add(shoe.draw())
+    dealer.add(shoe.draw())
+
+    # check_blackjack
+    player_natural = player.score == 21
+    dealer_natural = dealer.score == 21
+    outcome = np.full(lanes, DRAW, dtype=np.int8)
+    net = np.zeros(lanes)
+    outcome[player_natural & ~dealer_natural] = WIN
+    net[player_natural & ~dealer_natural] = rules.blackjack_payout
+    outcome[dealer_natural & ~player_natural] = LOSE
+    net[dealer_natural & ~player_natural] = -1
+    active = ~(player_natural | dealer_natural)
+
+    # hit until stand_on; a bust ends the round without a dealer turn
+    hitting = active & _wants_hit(player, upcard, stand_on, strategy)
+    while hitting.any():
+        shoe.check(hitting)
+        player.add(shoe.draw(hitting))
+        active &= player.score <= 21
+        hitting &= active & _wants_hit(player, upcard, stand_on, strategy)
+    busted = ~(player_natural | dealer_natural) & ~active
+    outcome[busted] = LOSE
+    net[busted] = -1
+
+    # dealer_turn: draw while the compiled rule table says so
+    drawing = active & dealer_hits[dealer.score * 2 + dealer.soft]
+    while drawing.any():
+        shoe.check(drawing)
+        dealer.add(shoe.draw(drawing))
+        drawing &= dealer_hits[dealer.score * 2 + dealer.soft]
+
+    # determine_winner
+    player_score = player.score
+    dealer_score = dealer.score
+    won = active & ((dealer_score > 21) | (player_score > dealer_score))
+    lost = active & (dealer_score <= 21) & (player_score < dealer_score)
+    outcome[won] = WIN
+    net[won] = 1
+    outcome[lost] = LOSE
+    net[lost] = -1
+    return outcome, net, player_natural
+
+
+def _wants_hit(player, upcard, stand_on, strategy):
+    if strategy is None:
+        return player.score < stand_on
+    table = np.frombuffer(strategy.table, dtype=np.uint8)
+    score = np.minimum(player.score, 31)
+    index = table_index(score, player.soft.astype(np.intp), 0, HIT_STAND, upcard.astype(np.intp))
+    return table[index] == HIT
+
+
+def empty_tally():
+    return {
+        "rounds": 0,
+        "wins": 0,
+        "losses": 0,
+        "draws": 0,
+        "blackjacks": 0,
+        "net": 0.0,
+        "wagered": 0.0,
+        "stats": RoundStats(),
+    }
+
+
+def simulate(
+    rounds, lanes=4096, rules=None, stand_on=17, seed=None, strategy=None, progress=None, ramp=None
+):
+    """Play `rounds` rounds spread over `lanes` shoes and tally them.
+
+    Bets are one unit, or with a game.betting.BetRamp whatever it wagers at each lane's
+    true count before the deal; net is then in ramp units and tally["wagered"] sums the
+    bets. tally["stats"] is a game.stats.RoundStats of the per-round net for the EV
+    and its confidence interval; progress, if given, is called with it after every batch.
+    """
+    shoe = ShoeBatch(lanes, rules, seed)
+    tally = empty_tally()
+    while tally["rounds"] < rounds:
+        if ramp is not None:
+            # Reshuffle first, so no bet is sized on a count the shuffle then discards
+            shoe.check(cards=DEAL_CARDS)
+            wagers = ramp_wagers(ramp, shoe.true_count())
+        outcome, net, naturals = play_round(shoe, stand_on, strategy)
+        # The last batch may be larger than what is left to play
+        keep = min(lanes, rounds - tally["rounds"])
+        outcome = outcome[:keep]
+        net = net[:keep]
+        if ramp is not None:
+            net = net * wagers[:keep]
+            tally["wagered"] += float(wagers[:keep].sum())
+        else:
+            tally["wagered"] += keep
+        wins = int(np.count_nonzero(outcome == WIN))
+        losses = int(np.count_nonzero(outcome == LOSE))
+        draws = int(np.count_nonzero(outcome == DRAW))
+        blackjacks = int(np.count_nonzero(naturals[:keep]))
+        mean = net.mean()
+        tally["rounds"] += keep
+        tally["wins"] += wins
+        tally["losses"] += losses
+        tally["draws"] += draws
+        tally["blackjacks"] += blackjacks
+        tally["net"] += float(net.sum())
+        tally["stats"] += RoundStats.from_moments(
+            keep, mean, ((net - mean) ** 2).sum(), wins, losses, draws, 0, blackjacks
+        )
+        if progress is not None:
+            progress(tally["stats"])
+    return tally
+
+
+def main():
+    tally = simulate(1_000_000, seed=2024)
+    print(tally)
+    low, high = tally["stats"].confidence_interval()
+    print(f"EV per unit: {tally['net'] / tally['rounds']:+.4f} (95% CI {low:+.4f} to {high:+.4f})")
+
+
+if __name__ == "__main__":
+    main()
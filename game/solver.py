@@ -0,0 +1,224 @@
+# Composition-dependent basic strategy solved from the exact dealer odds, cached on disk
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from game import dealer_odds
+from game.dealer_odds import BUST, final_totals, remove_card, shoe_counts
+from game.rules import RuleSet
+
+CACHE_FILE = Path("database/strategy_cache.json")
+CACHE_VERSION = 1  # bump whenever the solver's math changes so stale tables are dropped
+
+UPCARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+
+# Chart letters: "D" doubles or else hits, "Ds" doubles or else stands, and likewise
+# "Rh"/"Rs" surrender or else hit/stand
+STAND = "S"
+HIT = "H"
+DOUBLE = "D"
+DOUBLE_STAND = "Ds"
+SPLIT = "P"
+SURRENDER = "Rh"
+SURRENDER_STAND = "Rs"
+
+SURRENDER_EV = -0.5
+
+
+def label(value):
+    return "A" if value == 11 else str(value)
+
+
+def hand_score(hard, ace):
+    return hard + 10 if ace and hard <= 11 else hard
+
+
+def draws(counts):
+    """(probability, value, composition after the draw) for every rank left in counts."""
+    remaining = sum(counts)
+    for i, n in enumerate(counts):
+        if n:
+            yield n / remaining, i + 1, counts[:i] + (n - 1,) + counts[i + 1:]
+
+
+@lru_cache(maxsize=None)
+def stand_ev(score, upcard, counts, hit_soft17):
+    if score > 21:
+        return -1.0
+    # Naturals are settled before the player acts, so the dealer here never holds one
+    probs = final_totals(upcard, counts, True, hit_soft17)
+    ev = probs[BUST]
+    for i in range(5):
+        if score > 17 + i:
+            ev += probs[i]
+        elif score < 17 + i:
+            ev -= probs[i]
+    return ev
+
+
+@lru_cache(maxsize=None)
+def _hit(hard, ace, upcard, counts, hit_soft17):
+    """EV of taking one card and then hitting or standing optimally."""
+    ev = 0.0
+    for p, value, drawn in draws(counts):
+        new_hard = hard + value
+        new_ace = ace or value == 1
+        score = hand_score(new_hard, new_ace)
+        if score > 21:
+            ev -= p
+        elif score == 21:
+            ev += p * stand_ev(21, upcard, drawn, hit_soft17)
+        else:
+            ev += p * max(
+                stand_ev(score, upcard, drawn, hit_soft17),
+                _hit(new_hard, new_ace, upcard, drawn, hit_soft17),
+            )
+    return ev
+
+
+def _double(hard, ace, upcard, counts, hit_soft17):
+    ev = 0.0
+    for p, value, drawn in draws(counts):
+        score = hand_score(hard + value, ace or value == 1)
+        ev += p * 2 * stand_ev(score, upcard, drawn, hit_soft17)
+    return ev
+
+
+def _split(value, upcard, counts, hit_soft17, double_after_split):
+    """Two independent hands of `value` (Ace = 1); split Aces get one card each."""
+    ev = 0.0
+    for p, second, drawn in draws(counts):
+        hard = value + second
+        ace = value == 1 or second == 1
+        score = hand_score(hard, ace)
+        options = [stand_ev(score, upcard, drawn, hit_soft17)]
+        if value != 1:
+            options.append(_hit(hard, ace, upcard, drawn, hit_soft17))
+            if double_after_split:
+                options.append(_double(hard, ace, upcard, drawn, hit_soft17))
+        ev += p * max(options)
+    return 2 * ev
+
+
+def action_evs(first, second, upcard, counts, hit_soft17=False, double_after_split=True):
+    """EV per initial unit of each action for the two-card hand first + second (Ace = 1).
+
+    `counts` is the shoe before the hand and the upcard are removed.
+    """
+    for value in (first, second, upcard):
+        counts = remove_card(counts, 11 if value == 1 else value)
+    upcard = 11 if upcard == 1 else upcard
+    hard = first + second
+    ace = first == 1 or second == 1
+    evs = {
+        STAND: stand_ev(hand_score(hard, ace), upcard, counts, hit_soft17),
+        HIT: _hit(hard, ace, upcard, counts, hit_soft17),
+        DOUBLE: _double(hard, ace, upcard, counts, hit_soft17),
+    }
+    if first == second:
+        evs[SPLIT] = _split(first, upcard, counts, hit_soft17, double_after_split)
+    return evs
+
+
+def _best(evs, allow_split=False, allow_surrender=False):
+    actions = [STAND, HIT, DOUBLE] + ([SPLIT] if allow_split else [])
+    best = max(actions, key=lambda action: evs[action])
+    if allow_surrender and SURRENDER_EV > evs[best]:
+        return SURRENDER_STAND if evs[STAND] >= evs[HIT] else SURRENDER
+    if best == DOUBLE and evs[STAND] >= evs[HIT]:
+        return DOUBLE_STAND
+    return best
+
+
+def _weighted_best(combos, counts, upcard, hit_soft17, double_after_split, surrender):
+    """Best action for a chart row, weighting each two-card combo by how often it is dealt."""
+    totals = {STAND: 0.0, HIT: 0.0, DOUBLE: 0.0}
+    weights = 0
+    for first, second in combos:
+        if first == second:
+            weight = counts[first - 1] * (counts[first - 1] - 1)
+        else:
+            weight = 2 * counts[first - 1] * counts[second - 1]
+        weights += weight
+        evs = action_evs(first, second, upcard, counts, hit_soft17, double_after_split)
+        for action in totals:
+            totals[action] += weight * evs[action]
+    for action in totals:
+        totals[action] /= weights
+    return _best(totals, allow_surrender=surrender)
+
+
+def solve(rules=None):
+    """Solve the hit/stand/double/split chart as {"hard": ..., "soft": ..., "pairs": ...}.
+
+    Rows are keyed by player total (pairs by card), columns by dealer upcard label.
+    The EV memos run to millions of entries, so they are dropped before returning.
+    """
+    try:
+        return _solve(rules if rules is not None else RuleSet())
+    finally:
+        clear_cache()
+
+
+def _solve(rules):
+    hit_soft17 = rules.hit_soft17
+    double_after_split = rules.double_after_split
+    surrender = rules.surrender
+    counts = shoe_counts(rules.decks)
+    table = {"hard": {}, "soft": {}, "pairs": {}}
+    for upcard in UPCARDS:
+        column = label(upcard)
+        up = 1 if upcard == 11 else upcard
+        for total in range(4, 21):
+            combos = [(a, total - a) for a in range(2, 11) if a <= total - a <= 10]
+            table["hard"].setdefault(str(total), {})[column] = _weighted_best(
+                combos, counts, up, hit_soft17, double_after_split, surrender
+            )
+        table["hard"].setdefault("21", {})[column] = STAND
+        for other in range(1, 10):
+            row = table["soft"].setdefault(str(hand_score(1 + other, True)), {})
+            evs = action_evs(1, other, up, counts, hit_soft17, double_after_split)
+            row[column] = _best(evs, allow_surrender=surrender)
+        table["soft"].setdefault("21", {})[column] = STAND
+        for value in range(1, 11):
+            evs = action_evs(value, value, up, counts, hit_soft17, double_after_split)
+            table["pairs"].setdefault(label(11 if value == 1 else value), {})[column] = _best(
+                evs, allow_split=True, allow_surrender=surrender
+            )
+    return table
+
+
+def cache_key(rules):
+    # Only the rules that change a decision; penetration and payouts don't
+    return (
+        f"decks={rules.decks},h17={int(rules.hit_soft17)},"
+        f"das={int(rules.double_after_split)},ls={int(rules.surrender)}"
+    )
+
+
+def load_strategy(rules=None, cache_file=CACHE_FILE):
+    """Return the solved chart for these rules, solving and caching it on first use."""
+    rules = rules if rules is not None else RuleSet()
+    cache = {"version": CACHE_VERSION, "tables": {}}
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r") as f:
+                stored = json.load(f)
+            if stored.get("version") == CACHE_VERSION:
+                cache = stored
+        except (OSError, ValueError):
+            pass
+
+    key = cache_key(rules)
+    if key not in cache["tables"]:
+        cache["tables"][key] = solve(rules)
+        cache_file.parent.mkdir(exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(cache, f, indent=2)
+    return cache["tables"][key]
+
+
+def clear_cache():
+    stand_ev.cache_clear()
+    _hit.cache_clear()
+    dealer_odds.clear_cache()
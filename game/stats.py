@@ -0,0 +1,110 @@
+# Streaming per-round statistics: Welford mean/variance plus outcome counts, mergeable
+import math
+
+
+class RoundStats:
+    """Running totals of per-round net results (in initial bets) and outcomes.
+
+    add() is O(1) and stores no history. Two accumulators combine with merge() (or +=),
+    so parallel workers can each keep one and report a single EV and confidence interval.
+    """
+
+    __slots__ = ("rounds", "mean", "m2", "wins", "losses", "draws", "surrenders", "blackjacks")
+
+    def __init__(self):
+        self.rounds = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.surrenders = 0
+        self.blackjacks = 0
+
+    def add(self, net, result=None, blackjack=False):
+        self.rounds += 1
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self.m2 += delta * (net - self.mean)
+        if result == "win":
+            self.wins += 1
+        elif result == "lose":
+            self.losses += 1
+        elif result == "draw":
+            self.draws += 1
+        elif result == "surrender":
+            self.surrenders += 1
+        if blackjack:
+            self.blackjacks += 1
+
+    @classmethod
+    def from_moments(cls, rounds, mean, m2, wins=0, losses=0, draws=0, surrenders=0, blackjacks=0):
+        """An accumulator for a batch summarised elsewhere, e.g. with NumPy."""
+        stats = cls()
+        stats.rounds = rounds
+        stats.mean = float(mean)
+        stats.m2 = float(m2)
+        stats.wins = wins
+        stats.losses = losses
+        stats.draws = draws
+        stats.surrenders = surrenders
+        stats.blackjacks = blackjacks
+        return stats
+
+    def merge(self, other):
+        # Chan et al.'s pairwise update of the mean and m2
+        rounds = self.rounds + other.rounds
+        if rounds:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.rounds * other.rounds / rounds
+            self.mean += delta * other.rounds / rounds
+        self.rounds = rounds
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.surrenders += other.surrenders
+        self.blackjacks += other.blackjacks
+        return self
+
+    __iadd__ = merge
+
+    @property
+    def net(self):
+        return self.mean * self.rounds
+
+    @property
+    def variance(self):
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def stderr(self):
+        return self.stdev / math.sqrt(self.rounds) if self.rounds else 0.0
+
+    def confidence_interval(self, z=1.96):
+        """(low, high) bounds on the EV per round; z=1.96 is a 95% interval."""
+        margin = z * self.stderr()
+        return self.mean - margin, self.mean + margin
+
+    def blackjack_frequency(self):
+        return self.blackjacks / self.rounds if self.rounds else 0.0
+
+    def as_dict(self):
+        low, high = self.confidence_interval()
+        return {
+            "rounds": self.rounds,
+            "net": self.net,
+            "ev": self.mean,
+            "stdev": self.stdev,
+            "ci95": (low, high),
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "surrenders": self.surrenders,
+            "blackjacks": self.blackjacks,
+        }
+
+    def __repr__(self):
+        return f"RoundStats(rounds={self.rounds}, ev={self.mean:+.5f} ± {1.96 * self.stderr():.5f})"
@@ -0,0 +1,137 @@
+# Strategy charts compiled into one flat lookup table for bots and simulations
+import csv
+import json
+from array import array
+
+from game.solver import load_strategy
+
+STAND = 0
+HIT = 1
+DOUBLE = 2
+SPLIT = 3
+SURRENDER = 4
+
+ACTION_NAMES = ("stand", "hit", "double", "split", "surrender")
+
+# Values of the options axis: what the hand may still do besides hit and stand
+HIT_STAND = 0
+MAY_DOUBLE = 1
+MAY_SURRENDER = 2  # may double and surrender: the untouched two-card hand
+
+UPCARD_LABELS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "A")
+
+# Table dimensions; every index is built from Card values, so the upcard/pair axes run to 11
+TOTALS = 32
+PAIRS = 12  # 0 = not a pair (or splitting not allowed), else the pair's Card value
+OPTIONS = 3
+UPCARDS = 12
+
+
+def table_index(total, soft, pair, options, upcard):
+    return (((total * 2 + soft) * PAIRS + pair) * OPTIONS + options) * UPCARDS + upcard
+
+
+def _label(value):
+    return "A" if value == 11 else str(value)
+
+
+def _letter_code(letter, options):
+    if letter == "S":
+        return STAND
+    if letter == "H":
+        return HIT
+    if letter == "D":
+        return DOUBLE if options >= MAY_DOUBLE else HIT
+    if letter == "Ds":
+        return DOUBLE if options >= MAY_DOUBLE else STAND
+    if letter == "P":
+        return SPLIT
+    if letter == "Rh":
+        return SURRENDER if options == MAY_SURRENDER else HIT
+    if letter == "Rs":
+        return SURRENDER if options == MAY_SURRENDER else STAND
+    raise ValueError(f"Unknown strategy action: {letter}")
+
+
+class Strategy:
+    """A solver-style chart ({"hard", "soft", "pairs"} rows of upcard -> letter) compiled
+    into a dense array, so choosing an action is one index into self.table.
+
+    The options axis resolves "D"/"Ds" and "Rh"/"Rs" at compile time and a pair value
+    of 0 skips the pairs chart, so callers never branch on what the table allows.
+    """
+
+    def __init__(self, chart):
+        self.chart = chart
+        self.table = array("B", bytes(TOTALS * 2 * PAIRS * OPTIONS * UPCARDS))
+        for total in range(TOTALS):
+            for soft in (0, 1):
+                for pair in range(PAIRS):
+                    for options in range(OPTIONS):
+                        for upcard in range(2, UPCARDS):
+                            index = table_index(total, soft, pair, options, upcard)
+                            self.table[index] = self._compile(total, soft, pair, options, upcard)
+
+    def _compile(self, total, soft, pair, options, upcard):
+        if total >= 21:
+            return STAND
+        column = _label(upcard)
+        if pair:
+            letter = self.chart["pairs"].get(_label(pair), {}).get(column)
+            if letter is not None:
+                return _letter_code(letter, options)
+        row = self.chart["soft" if soft else "hard"].get(str(total))
+        if row is None:
+            return HIT
+        return _letter_code(row[column], options)
+
+    def action(self, total, soft, pair, options, upcard):
+        return self.table[table_index(total, soft, pair, options, upcard)]
+
+    def play(self, game):
+        """Drive a dealt Blackjack hand to the end of the player's turn."""
+        upcard = game.dealerHand[0].value
+        if game.currentTurn == "Insurance":
+            # Basic strategy never insures
+            game.insurance(False)
+        while not game.gameOver and game.currentTurn == "Player":
+            total = game.playerTotal
+            pair = game.playerHand[0].value if game.can_split() else 0
+            if game.can_surrender():
+                options = MAY_SURRENDER
+            else:
+                options = MAY_DOUBLE if game.can_double() else HIT_STAND
+            code = self.table[table_index(total.score, total.soft, pair, options, upcard)]
+            if code == HIT:
+                game.hit()
+            elif code == DOUBLE:
+                game.double_down()
+            elif code == SPLIT:
+                game.split()
+            elif code == SURRENDER:
+                game.surrender()
+            else:
+                game.stand()
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_csv(cls, path):
+        """Rows of `section,row,<one letter per upcard 2..10,A>` with a header line."""
+        chart = {"hard": {}, "soft": {}, "pairs": {}}
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            next(reader)
+            for record in reader:
+                if not record:
+                    continue
+                section, row, letters = record[0], record[1], record[2:]
+                chart[section][row] = dict(zip(UPCARD_LABELS, letters))
+        return cls(chart)
+
+    @classmethod
+    def solved(cls, rules=None):
+        return cls(load_strategy(rules))
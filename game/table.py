@@ -0,0 +1,75 @@
+# Multi-seat table: up to seven Blackjack seats drawing from one shoe against one dealer
+from game.blackjack import Blackjack
+from game.hand import HandTotal
+from game.rules import RuleSet
+from game.shoe import Shoe
+
+MAX_SEATS = 7
+
+
+class Table:
+    """Seats are ordinary Blackjack engines that share this table's shoe, counter and
+    dealer hand; the table deals in casino order and plays the dealer once per round.
+    """
+
+    def __init__(self, seats=1, rules=None, shoe=None, rng=None, counter=None):
+        if not 1 <= seats <= MAX_SEATS:
+            raise ValueError(f"a table has 1 to {MAX_SEATS} seats")
+        self.rules = rules if rules is not None else RuleSet()
+        self.shoe = shoe if shoe is not None else Shoe(self.rules.decks, rng)
+        self.seats = [Blackjack(self.shoe, counter=counter, rules=self.rules) for i in range(seats)]
+        for seat in self.seats:
+            seat.dealerPlays = False
+        self.dealerHand = []
+        self.dealerTotal = HandTotal()
+        self.dealerScore = 0
+
+    def deal(self):
+        """Start a round: one shoe check that leaves enough cards for the whole deal, then a
+        card to each seat left to right and the dealer's upcard, then a second card to each
+        seat and the dealer's hole card."""
+        first = self.seats[0]
+        first.return_discards()
+        first.check_deck(2 * len(self.seats) + 2)
+        self.dealerHand.clear()
+        self.dealerTotal.reset()
+        for seat in self.seats:
+            seat.reset_game()
+            seat.dealerHand = self.dealerHand
+            seat.dealerTotal = self.dealerTotal
+        for i in range(2):
+            for seat in self.seats:
+                card = first.draw_card()
+                seat.playerHand.append(card)
+                seat.playerTotal.add(card.value)
+            card = first.draw_card()
+            self.dealerHand.append(card)
+            self.dealerTotal.add(card.value)
+        self.dealerScore = self.dealerTotal.score
+        for seat in self.seats:
+            seat.open_round()
+
+    def dealer_turn(self):
+        """Play the dealer once for every seat still waiting on it, then settle those seats."""
+        waiting = [seat for seat in self.seats if not seat.gameOver and seat.currentTurn == "Dealer"]
+        if waiting:
+            first = self.seats[0]
+            hits = self.rules.dealer_hits
+            while hits[self.dealerTotal.score * 2 + self.dealerTotal.soft]:
+                first.check_deck()
+                card = first.draw_card()
+                self.dealerHand.append(card)
+                self.dealerTotal.add(card.value)
+        self.dealerScore = self.dealerTotal.score
+        for seat in waiting:
+            seat.dealerScore = self.dealerScore
+            seat.determine_winner()
+
+    def play_round(self, strategies):
+        """Deal, let each seat's strategy (e.g. game.strategy.Strategy) act in seat order,
+        resolve the dealer and return each seat's net result in initial bets."""
+        self.deal()
+        for seat, strategy in zip(self.seats, strategies):
+            strategy.play(seat)
+        self.dealer_turn()
+        return [seat.settle() for seat in self.seats]
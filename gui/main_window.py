@@ -167,12 +167,7 @@ class MainWindow:
         self.end_game()
         
     def double_down(self):
-        if self.player.chips >= self.player.current_bet:
-            self.player.chips -= self.player.current_bet
-            self.player.current_bet *= 2
-            self.game.hit()
-            if not self.game.gameOver:
-                self.game.stand()
+        if self.player.can_cover() and self.game.double_down():
             self.display_cards()
             self.update_display()
             self.end_game()
@@ -220,8 +215,7 @@ class MainWindow:
         self.hit_btn.configure(state='normal')
         self.stand_btn.configure(state='normal')
         
-        can_double = (len(self.game.playerHand) == 2 and 
-                     self.player.chips >= self.player.current_bet)
+        can_double = self.game.can_double() and self.player.can_cover()
         self.double_btn.configure(state='normal' if can_double else 'disabled')
         
     def disable_game_buttons(self):
@@ -234,16 +228,12 @@ class MainWindow:
         self.game_in_progress = False
         self.disable_game_buttons()
         
-        result_text = ""
+        self.player.settle_bet(self.game.settle(), self.game.result, self.game.player_natural())
         if self.game.result == "win":
-            multiplier = 0.5 if self.game.blackjack else 1
-            self.player.win_bet(multiplier)
             result_text = "BLACKJACK! You Win!" if self.game.blackjack else "You Win!"
         elif self.game.result == "lose":
-            self.player.lose_bet()
             result_text = "Dealer Wins!"
         else:
-            self.player.draw_bet()
             result_text = "Push (Tie)!"
             
         messagebox.showinfo("Game Over", result_text)
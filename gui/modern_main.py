@@ -367,12 +367,7 @@ class ResponsiveMainWindow:
         self.root.after(500, self.end_game)
         
     def double_down(self):
-        if self.player.chips >= self.player.current_bet:
-            self.player.chips -= self.player.current_bet
-            self.player.current_bet *= 2
-            self.game.hit()
-            if not self.game.gameOver:
-                self.game.stand()
+        if self.player.can_cover() and self.game.double_down():
             self.display_cards()
             self.update_display()
             self.root.after(500, self.end_game)
@@ -441,8 +436,7 @@ class ResponsiveMainWindow:
         self.hit_btn.configure(state="normal")
         self.stand_btn.configure(state="normal")
         
-        can_double = (len(self.game.playerHand) == 2 and 
-                     self.player.chips >= self.player.current_bet)
+        can_double = self.game.can_double() and self.player.can_cover()
         self.double_btn.configure(state="normal" if can_double else "disabled")
         
     def disable_game_buttons(self):
@@ -456,13 +450,7 @@ class ResponsiveMainWindow:
         self.disable_game_buttons()
         
         # Handle winnings
-        if self.game.result == "win":
-            multiplier = 0.5 if self.game.blackjack else 1
-            self.player.win_bet(multiplier)
-        elif self.game.result == "lose":
-            self.player.lose_bet()
-        else:
-            self.player.draw_bet()
+        self.player.settle_bet(self.game.settle(), self.game.result, self.game.player_natural())
             
         # Show floating modal instead of full-screen modal
         show_floating_game_result(self.root, self.game.result, self.game.blackjack)
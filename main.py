@@ -31,16 +31,13 @@ def main():
         
         if game.blackjack:
             print(f"Result: {game.result.upper()}")
-            if game.result == "win":
-                player.win_bet(0.5)  # Blackjack pays 3:2
-            elif game.result == "lose":
-                player.lose_bet()
-            else:
-                player.draw_bet()
+            player.settle_bet(game.settle(), game.result, game.player_natural())  # Blackjack pays 3:2
             continue
             
         while not game.gameOver and game.currentTurn == "Player":
-            action = input("Hit (h) or Stand (s)? ").lower()
+            can_double = game.can_double() and player.can_cover()
+            prompt = "Hit (h), Stand (s) or Double (d)? " if can_double else "Hit (h) or Stand (s)? "
+            action = input(prompt).lower()
             if action == 'h':
                 game.hit()
                 print(f"Your hand: {[str(card) for card in game.playerHand]} (Score: {game.playerScore})")
@@ -48,6 +45,11 @@ def main():
                     print("Bust!")
             elif action == 's':
                 game.stand()
+            elif action == 'd' and can_double:
+                game.double_down()
+                print(f"Your hand: {[str(card) for card in game.playerHand]} (Score: {game.playerScore})")
+                if game.playerScore > 21:
+                    print("Bust!")
             else:
                 print("Invalid action!")
                 
@@ -55,12 +57,7 @@ def main():
             print(f"\nDealer's hand: {[str(card) for card in game.dealerHand]} (Score: {game.dealerScore})")
             print(f"Result: {game.result.upper()}")
             
-        if game.result == "win":
-            player.win_bet()
-        elif game.result == "lose":
-            player.lose_bet()
-        else:
-            player.draw_bet()
+        player.settle_bet(game.settle(), game.result, game.player_natural())
     
     stats = player.get_stats()
     print(f"\nFinal Stats: {stats['games']} games, {stats['wins']} wins, Win rate: {stats['win_rate']}%")
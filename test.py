@@ -1,5 +1,6 @@
 from game.blackjack import Blackjack
 from game.card import Card
+from game.rules import RuleSet
 
 game = Blackjack()
 
@@ -122,3 +123,72 @@ print(
     game.determine_winner(),
 )  # False, None, False, False, 0
 # Expected Output
+
+
+def stack_deck(game, ranks):
+    # Cards are popped from the end, so the ranks go last in reverse deal order;
+    # the filler keeps the deck above DECK_THRESHOLD so deal_cards doesn't reshuffle
+    game.deck = [Card("2", "C")] * 300 + [Card(rank, "S") for rank in reversed(ranks)]
+
+
+print(" ")
+print("testing split/double/insurance/surrender with stacked decks")
+
+# Test 3: split 8s, double the first hand after the split
+# Deal order: player, dealer, player, dealer, then the split and drawn cards
+game = Blackjack()
+stack_deck(game, ["8", "6", "8", "10", "3", "10", "9", "10"])
+game.deal_cards()
+game.split()  # first hand 8+3 = 11
+game.double_down()  # 8+3+10 = 21, then the second hand gets its 9 = 17
+game.stand()  # dealer 6+10 draws a 10 and busts
+print(
+    "Split 8s + DAS:",
+    game.handCount,
+    game.handWagers[:2],
+    game.handResults[:2],
+    game.dealerScore,
+    game.result,
+    game.settle(),
+)  # 2, [2, 1], ['win', 'win'], 26, 'win', 3
+
+# Test 4: split Aces get one card each and the dealer plays at once
+game = Blackjack()
+stack_deck(game, ["A", "9", "A", "8", "K", "5"])
+game.deal_cards()
+game.split()  # A+K = 21 (not a natural), A+5 = soft 16
+print(
+    "Split Aces:",
+    [game.handTotals[i].score for i in range(game.handCount)],
+    game.handResults[:2],
+    game.dealerScore,
+    game.result,
+    game.settle(),
+)  # [21, 16], ['win', 'lose'], 17, 'draw', 0
+
+# Test 5: insurance against a dealer natural
+game = Blackjack(rules=RuleSet(insurance=True))
+stack_deck(game, ["10", "A", "7", "K"])
+game.deal_cards()
+print("Insurance offered:", game.currentTurn)  # Insurance
+game.insurance(True)
+print(
+    "Insurance vs natural:",
+    game.dealerBlackjack,
+    game.result,
+    game.gameOver,
+    game.settle(),
+)  # True, 'lose', True, 0.0
+
+# Test 6: even money on a natural against a dealer Ace
+game = Blackjack(rules=RuleSet(insurance=True))
+stack_deck(game, ["A", "A", "K", "7"])
+game.deal_cards()
+print("Even money:", game.even_money(), game.result, game.settle())  # True, 'win', 1
+
+# Test 7: late surrender
+game = Blackjack(rules=RuleSet(surrender=True))
+stack_deck(game, ["10", "10", "6", "7"])
+game.deal_cards()
+print("Late surrender:", game.surrender(), game.result, game.gameOver, game.settle())
+# True, 'surrender', True, -0.5